@@ -1,22 +1,20 @@
+import logging
+
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.db.database import SessionLocal
+from backend.app.db.session import get_db, transaction
 from backend.app.models.user_model import User
 from backend.app.models.institute_model import Institute  # ✅ NEW
 from backend.app.schemas.user_schema import UserCreate, UserLogin
-from backend.app.core.security import hash_password, verify_password
+from backend.app.core.security import create_access_token, needs_rehash, password_hasher
+from backend.app.core.principal import require_roles, revoked_users, token_claims
+from backend.app.services.dashboard_stats import invalidate_dashboard, record_faculty_signup
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-
-# ---------------- DB DEPENDENCY ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+logger = logging.getLogger(__name__)
 
 
 # ✅ Allowed roles
@@ -25,9 +23,7 @@ ALLOWED_ROLES = ["superadmin", "coe", "faculty"]
 
 # ---------------- SIGNUP ----------------
 @router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-
-    print("🔥 Signup request received:", user)
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
 
     try:
         # ✅ Role validation
@@ -39,7 +35,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
             raise HTTPException(400, "Password too long (max 72 characters)")
 
         # ✅ Check if user exists
-        existing = db.query(User).filter(User.username == user.username).first()
+        existing = await db.scalar(select(User).where(User.username == user.username))
         if existing:
             raise HTTPException(400, "Username already exists")
 
@@ -54,9 +50,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
             if not user.institute_id:
                 raise HTTPException(400, "Institute required for COE/Faculty")
 
-            institute = db.query(Institute).filter(
-                Institute.id == user.institute_id
-            ).first()
+            institute = await db.get(Institute, user.institute_id)
 
             if not institute:
                 raise HTTPException(400, "Invalid institute")
@@ -64,62 +58,80 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
             institute_id = user.institute_id
 
         # ---------------- CREATE USER ----------------
-        new_user = User(
-            first_name=user.first_name,
-            last_name=user.last_name,
-            username=user.username,
-            password=hash_password(user.password),
-            role=user.role,
-            institute_id=institute_id  # ✅ IMPORTANT
-        )
-
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-
-        print(
-            "✅ User created:",
-            new_user.username,
-            "| Role:",
-            new_user.role,
-            "| Institute:",
-            new_user.institute_id
-        )
+        # bcrypt is CPU-bound: bounded pool, off the event loop
+        hashed = await password_hasher.hash(user.password)
+
+        async with transaction(db):
+            new_user = User(
+                first_name=user.first_name,
+                last_name=user.last_name,
+                username=user.username,
+                password=hashed,
+                role=user.role,
+                institute_id=institute_id  # ✅ IMPORTANT
+            )
+
+            db.add(new_user)
+
+            # 📊 dashboard rollup, same transaction
+            if new_user.role == "faculty":
+                await record_faculty_signup(db, institute_id)
+
+        if new_user.role == "faculty":
+            invalidate_dashboard(institute_id)
+
+        logger.info("user created", extra={
+            "user_id": new_user.id,
+            "role": new_user.role,
+            "institute_id": new_user.institute_id
+        })
 
         return {"message": "User created successfully"}
 
     except HTTPException as e:
         raise e
 
-    except Exception as e:
-        print("❌ ERROR:", str(e))
+    except Exception:
+        logger.exception("signup failed")
         raise HTTPException(500, "Internal server error")
 
 
 # ---------------- LOGIN ----------------
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-
-    print("🔐 Login attempt:", user.username, "| Role:", user.role)
+async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
 
     try:
         # ✅ Check username + role
-        db_user = db.query(User).filter(
+        db_user = await db.scalar(select(User).where(
             User.username == user.username,
             User.role == user.role
-        ).first()
+        ))
 
         if not db_user:
             raise HTTPException(401, "Invalid username, role, or password")
 
         # ✅ Check password
-        if not verify_password(user.password, db_user.password):
+        if not await password_hasher.verify(user.password, db_user.password):
             raise HTTPException(401, "Invalid username, role, or password")
 
-        print("✅ Login successful")
+        # ✅ Deactivated accounts cannot log in
+        if db_user.is_active is False:
+            raise HTTPException(403, "Account disabled")
+
+        # ✅ Cost factor changed since this hash was made: upgrade it now
+        if needs_rehash(db_user.password):
+            new_hash = await password_hasher.hash(user.password)
+            async with transaction(db):
+                await db.execute(
+                    update(User).where(User.id == db_user.id).values(password=new_hash)
+                )
+
+        logger.debug("login", extra={"user_id": db_user.id, "role": db_user.role})
 
         return {
             "message": "Login successful",
+            "access_token": create_access_token(token_claims(db_user)),
+            "token_type": "bearer",
             "username": db_user.username,
             "role": db_user.role,
             "user_id": db_user.id,
@@ -129,30 +141,65 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
     except HTTPException as e:
         raise e
 
-    except Exception as e:
-        print("❌ ERROR:", str(e))
+    except Exception:
+        logger.exception("login failed")
         raise HTTPException(500, "Internal server error")
-    
-from backend.app.models.institute_model import Institute
+
 
 @router.post("/superadmin-signup")
-def superadmin_signup(data: dict, db: Session = Depends(get_db)):
-
-    institute = Institute(name=data["institute_name"])
-    db.add(institute)
-    db.commit()
-    db.refresh(institute)
-
-    user = User(
-        first_name=data["first_name"],
-        last_name=data["last_name"],
-        username=data["username"],
-        password=hash_password(data["password"]),
-        role="superadmin",
-        institute_id=institute.id
-    )
-
-    db.add(user)
-    db.commit()
-
-    return {"message": "Superadmin + Institute created"}
\ No newline at end of file
+async def superadmin_signup(data: dict, db: AsyncSession = Depends(get_db)):
+
+    hashed = await password_hasher.hash(data["password"])
+
+    # ✅ institute + superadmin in one transaction
+    async with transaction(db):
+        institute = Institute(name=data["institute_name"])
+        db.add(institute)
+        await db.flush()  # assigns institute.id
+
+        user = User(
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            username=data["username"],
+            password=hashed,
+            role="superadmin",
+            institute_id=institute.id
+        )
+
+        db.add(user)
+
+    return {"message": "Superadmin + Institute created"}
+
+
+# ---------------- ACTIVATE / DEACTIVATE USER (SUPERADMIN) ----------------
+@router.put("/users/{user_id}/active")
+async def set_user_active(
+    user_id: int,
+    data: dict,
+    principal: dict = Depends(require_roles("superadmin")),
+    db: AsyncSession = Depends(get_db)
+):
+    is_active = bool(data.get("is_active"))
+
+    async with transaction(db):
+        result = await db.execute(
+            update(User).where(User.id == user_id).values(is_active=is_active)
+        )
+
+        if not result.rowcount:
+            raise HTTPException(404, "User not found")
+
+    # ✅ existing tokens stop working right away in this worker,
+    # other workers pick it up on their next revocation refresh
+    if is_active:
+        revoked_users.restore(user_id)
+    else:
+        revoked_users.revoke(user_id)
+
+    return {"message": f"User {'activated' if is_active else 'deactivated'}"}
+
+
+# ---------------- PASSWORD HASHING METRICS ----------------
+@router.get("/password-hashing/stats")
+async def password_hashing_stats():
+    return password_hasher.stats()
@@ -1,45 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.db.database import SessionLocal
-from backend.app.models.user_model import User
-from backend.app.models.institute_model import Institute
+from backend.app.db.session import get_db
+from backend.app.core.principal import require_roles
+from backend.app.services.dashboard_stats import get_dashboard
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ---------------- COE DASHBOARD ----------------
 @router.get("/coe/{user_id}")
-def coe_dashboard(user_id: int, db: Session = Depends(get_db)):
-
-    user = db.query(User).filter(User.id == user_id).first()
-
-    if not user or user.role != "coe":
+async def coe_dashboard(
+    user_id: int,
+    principal: dict = Depends(require_roles("coe")),
+    db: AsyncSession = Depends(get_db)
+):
+
+    # ✅ role and institute come from the token, no user lookup
+    if principal["user_id"] != user_id:
         raise HTTPException(403, "Not authorized")
 
-    institute = db.query(Institute).filter(
-        Institute.id == user.institute_id
-    ).first()
-
-    # 👨‍🏫 Faculty count
-    faculty_count = db.query(User).filter(
-        User.role == "faculty",
-        User.institute_id == user.institute_id
-    ).count()
+    # 📊 precomputed rollup (cached), one primary-key read on a miss
+    dashboard = await get_dashboard(db, principal["institute_id"])
 
-    # 📄 Placeholder (we'll add real table later)
-    question_papers = []
+    if dashboard is None:
+        raise HTTPException(404, "Institute not found")
 
-    return {
-        "institute_name": institute.name,
-        "faculty_count": faculty_count,
-        "question_papers": question_papers
-    }
\ No newline at end of file
+    return dashboard
@@ -1,34 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from backend.app.db.database import SessionLocal
+from backend.app.db.session import get_db, transaction
+from backend.app.core.principal import require_roles
 from backend.app.models.institute_model import Institute
+from backend.app.db.pagination import MAX_PAGE_SIZE, keyset_page, set_next_cursor
+from backend.app.utils.json_response import json_response
 
 router = APIRouter(prefix="/institutes", tags=["Institutes"])
 
 
-# ---------------- DB DEPENDENCY ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ---------------- CREATE INSTITUTE ----------------
 @router.post("/")
-def create_institute(name: str, db: Session = Depends(get_db)):
+async def create_institute(
+    name: str,
+    principal: dict = Depends(require_roles("superadmin")),
+    db: AsyncSession = Depends(get_db)
+):
 
-    existing = db.query(Institute).filter(Institute.name == name).first()
+    existing = await db.scalar(select(Institute).where(Institute.name == name))
     if existing:
         raise HTTPException(400, "Institute already exists")
 
-    institute = Institute(name=name)
-
-    db.add(institute)
-    db.commit()
-    db.refresh(institute)
+    async with transaction(db):
+        institute = Institute(name=name)
+        db.add(institute)
 
     return {
         "message": "Institute created successfully",
@@ -39,20 +37,27 @@ def create_institute(name: str, db: Session = Depends(get_db)):
 
 # ---------------- GET ALL INSTITUTES ----------------
 @router.get("/")
-def get_institutes(db: Session = Depends(get_db)):
+async def get_institutes(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
 
-    institutes = db.query(Institute).all()
+    # ✅ Oldest first (stable ordering for the superadmin list)
+    institutes, next_cursor = await keyset_page(
+        db, select(Institute), Institute.id, cursor, limit, descending=False
+    )
+    response = json_response(institutes)
+    set_next_cursor(response, next_cursor)
 
-    return institutes
+    return response
 
 @router.get("/{institute_id}")
-def get_institute(institute_id: int, db: Session = Depends(get_db)):
+async def get_institute(institute_id: int, db: AsyncSession = Depends(get_db)):
 
-    institute = db.query(Institute).filter(
-        Institute.id == institute_id
-    ).first()
+    institute = await db.get(Institute, institute_id)
 
     if not institute:
         raise HTTPException(404, "Institute not found")
 
-    return institute
\ No newline at end of file
+    return institute
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.app.services.job_queue import get_job, job_to_dict, TERMINAL_STATUSES
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# How often the event stream re-reads the job row
+POLL_INTERVAL_SECONDS = 1.0
+
+
+# ---------------- JOB STATUS (POLL) ----------------
+@router.get("/{job_id}")
+async def job_status(job_id: str):
+
+    job = await asyncio.to_thread(get_job, job_id)
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+
+    return job_to_dict(job)
+
+
+# ---------------- JOB EVENTS (SSE) ----------------
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+
+    job = await asyncio.to_thread(get_job, job_id)
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+
+    async def events():
+        last = None
+
+        while True:
+            job = await asyncio.to_thread(get_job, job_id)
+            if job is None:
+                return
+
+            state = (job.status, job.progress, job.stage)
+            if state != last:
+                last = state
+                data = job_to_dict(job, include_result=job.status in TERMINAL_STATUSES)
+                yield f"event: {job.status}\ndata: {json.dumps(data, default=str)}\n\n"
+
+            if job.status in TERMINAL_STATUSES:
+                return
+
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -0,0 +1,24 @@
+import hmac
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from backend.app.core.metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+# when set, scrapers must send "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+# ---------------- PROMETHEUS SCRAPE ----------------
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+
+    if METRICS_TOKEN:
+        expected = f"Bearer {METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            raise HTTPException(401, "Not authenticated")
+
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
@@ -1,26 +1,183 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import asyncio
+import json
 
-from backend.app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from backend.app.db.database import AsyncSessionLocal
+from backend.app.db.session import get_db, transaction
+from backend.app.core.principal import get_current_principal
 from backend.app.models.notification_model import Notification
+from backend.app.schemas.notification_schema import MarkReadRequest
+from backend.app.services.notification_bus import (
+    RESYNC_KEY,
+    notification_bus,
+    notification_to_dict,
+)
+from backend.app.utils.json_response import json_response
+from backend.app.db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    keyset_page,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+# SSE comment sent when nothing happened, keeps proxies from closing the stream
+KEEPALIVE_SECONDS = 15.0
+RECONNECT_MS = 3000
+
 
-# ---------------- DB ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def own_notifications(faculty_id: int, principal: dict = Depends(get_current_principal)) -> dict:
+    """Faculty can only read / stream / acknowledge their own notifications."""
+    if principal["user_id"] != faculty_id:
+        raise HTTPException(403, "Not authorized")
+    return principal
 
 
 # ---------------- GET NOTIFICATIONS ----------------
 @router.get("/{faculty_id}")
-def get_notifications(faculty_id: int, db: Session = Depends(get_db)):
-    notifications = db.query(Notification).filter(
+async def get_notifications(
+    faculty_id: int,
+    since_id: Optional[int] = None,
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    principal: dict = Depends(own_notifications),
+    db: AsyncSession = Depends(get_db)
+):
+    stmt = select(Notification).where(
         Notification.faculty_id == faculty_id
-    ).all()
+    )
+
+    if unread_only:
+        stmt = stmt.where(Notification.is_read.is_(False))
+
+    # ✅ Incremental fetch (reconnects): everything after since_id, oldest first
+    if since_id is not None:
+        stmt = stmt.where(Notification.id > since_id)
+        notifications, next_cursor = await keyset_page(
+            db, stmt, Notification.id, cursor, limit, descending=False
+        )
+
+    # ✅ Newest first via (faculty_id, id) index
+    else:
+        notifications, next_cursor = await keyset_page(db, stmt, Notification.id, cursor, limit)
+
+    response = json_response(notifications)
+    set_next_cursor(response, next_cursor)
+
+    return response
+
+
+# ---------------- MARK AS READ ----------------
+@router.post("/{faculty_id}/read")
+async def mark_read(
+    faculty_id: int,
+    data: Optional[MarkReadRequest] = None,
+    principal: dict = Depends(own_notifications),
+    db: AsyncSession = Depends(get_db)
+):
+    """Body: {"ids": [...]} or {"up_to_id": N}; an empty body marks everything."""
+    data = data or MarkReadRequest()
+
+    stmt = update(Notification).where(
+        Notification.faculty_id == faculty_id,
+        Notification.is_read.is_(False)
+    )
+
+    if data.ids is not None:
+        stmt = stmt.where(Notification.id.in_(data.ids))
+    elif data.up_to_id is not None:
+        stmt = stmt.where(Notification.id <= data.up_to_id)
+
+    async with transaction(db):
+        result = await db.execute(stmt.values(is_read=True))
+
+    return {"updated": result.rowcount}
+
+
+# ---------------- PUSH (SSE) ----------------
+def _sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.get("/{faculty_id}/stream")
+async def stream_notifications(
+    faculty_id: int,
+    request: Request,
+    since_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+    principal: dict = Depends(own_notifications)
+):
+    """
+    Server-Sent Events. Browsers resend `Last-Event-ID` on reconnect, so
+    anything missed while disconnected is replayed from the database first.
+    """
+    if since_id is None and last_event_id and last_event_id.isdigit():
+        since_id = int(last_event_id)
+
+    async def events():
+        # subscribe before the backfill so nothing falls between the two
+        queue = notification_bus.subscribe(faculty_id)
+        last_id = since_id
+        replay_after = since_id
+
+        try:
+            yield f"retry: {RECONNECT_MS}\n\n"
+
+            while not await request.is_disconnected():
+                # replay page by page until caught up, however long the gap
+                while replay_after is not None:
+                    # short-lived session per page: the stream itself may stay open for hours
+                    async with AsyncSessionLocal() as db:
+                        missed = (await db.scalars(
+                            select(Notification)
+                            .where(
+                                Notification.faculty_id == faculty_id,
+                                Notification.id > replay_after
+                            )
+                            .order_by(Notification.id)
+                            .limit(MAX_PAGE_SIZE)
+                        )).all()
+
+                    for notification in missed:
+                        replay_after = notification.id
+                        if last_id is None or notification.id > last_id:
+                            last_id = notification.id
+                            yield _sse(notification_to_dict(notification))
+
+                    if len(missed) < MAX_PAGE_SIZE or await request.is_disconnected():
+                        break
+
+                replay_after = None
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if RESYNC_KEY in event:
+                    # the bus dropped events for this (slow) stream: read them back
+                    replay_after = last_id if last_id is not None else event[RESYNC_KEY]
+                    continue
+
+                if last_id is not None and event["id"] <= last_id:
+                    continue  # already sent by the backfill
+
+                last_id = event["id"]
+                yield _sse(event)
+
+        finally:
+            notification_bus.unsubscribe(faculty_id, queue)
 
-    return notifications
\ No newline at end of file
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
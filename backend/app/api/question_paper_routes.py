@@ -1,111 +1,352 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from datetime import date, datetime, time
+from typing import Optional
 
-from backend.app.db.database import SessionLocal
+from backend.app.db.session import get_db, transaction
+from backend.app.core.principal import (
+    can_access_institute,
+    check_institute,
+    get_current_principal,
+    require_roles,
+)
 from backend.app.models.question_paper_model import QuestionPaper
+from backend.app.models.notification_model import Notification
+from backend.app.models.question_model import (
+    EDITABLE_FIELDS,
+    Question,
+    question_fields,
+    question_from_dict,
+    question_to_dict,
+)
+from backend.app.schemas.question_schema import QuestionUpdate
+from backend.app.services.notification_bus import notification_bus, notification_to_dict
+from backend.app.utils.json_response import json_response
+from backend.app.services.dashboard_stats import (
+    invalidate_dashboard,
+    record_status_changes,
+    record_submission,
+    utcnow,
+)
+from backend.app.db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    keyset_page,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/papers", tags=["Question Papers"])
 
-
-# ---------------- DB DEPENDENCY ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+REVIEW_STATUSES = ["approved", "rejected"]
+BULK_REVIEW_MAX_ITEMS = 500
 
 
 # ---------------- GET PAPERS BY INSTITUTE (COE) ----------------
 @router.get("/institute/{institute_id}")
-def get_papers(institute_id: int, db: Session = Depends(get_db)):
+async def get_papers(
+    institute_id: int,
+    status: Optional[str] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    principal: dict = Depends(require_roles("coe", "superadmin")),
+    db: AsyncSession = Depends(get_db)
+):
 
-    papers = db.query(QuestionPaper).filter(
+    check_institute(principal, institute_id)
+
+    stmt = select(QuestionPaper).where(
         QuestionPaper.institute_id == institute_id
-    ).all()
+    )
+
+    # ✅ Filters (served by the institute/status indexes)
+    if status:
+        stmt = stmt.where(QuestionPaper.status == status)
+    if created_from:
+        stmt = stmt.where(QuestionPaper.created_at >= datetime.combine(created_from, time.min))
+    if created_to:
+        stmt = stmt.where(QuestionPaper.created_at <= datetime.combine(created_to, time.max))
+
+    # ✅ Newest first, one page at a time
+    papers, next_cursor = await keyset_page(db, stmt, QuestionPaper.id, cursor, limit)
+
+    # ✅ Summaries only: question counts for this page in one grouped query
+    counts = {}
+    if papers:
+        rows = await db.execute(
+            select(Question.paper_id, func.count(Question.id))
+            .where(Question.paper_id.in_([paper.id for paper in papers]))
+            .group_by(Question.paper_id)
+        )
+        counts = dict(rows.all())
+
+    # ✅ orjson straight from the dicts (no jsonable_encoder pass)
+    response = json_response([paper_summary(paper, counts.get(paper.id, 0)) for paper in papers])
+    set_next_cursor(response, next_cursor)
+
+    return response
+
+
+def paper_summary(paper: QuestionPaper, question_count: int) -> dict:
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "faculty_id": paper.faculty_id,
+        "institute_id": paper.institute_id,
+        "status": paper.status,
+        "created_at": paper.created_at,
+        "question_count": question_count,
+    }
+
+
+async def get_paper_or_404(db: AsyncSession, paper_id: int, with_questions=False) -> QuestionPaper:
+    stmt = select(QuestionPaper).where(QuestionPaper.id == paper_id)
+    if with_questions:
+        stmt = stmt.options(selectinload(QuestionPaper.questions))
+
+    paper = await db.scalar(stmt)
+
+    if not paper:
+        raise HTTPException(status_code=404, detail="Paper not found")
+
+    return paper
+
+
+def check_paper_access(principal: dict, paper: QuestionPaper):
+    """Faculty see their own papers; COE / superadmin their institute's."""
+    if principal["role"] == "faculty":
+        if paper.faculty_id != principal["user_id"]:
+            raise HTTPException(status_code=403, detail="Not authorized")
+    else:
+        check_institute(principal, paper.institute_id)
+
+
+# ---------------- GET ONE PAPER (assembled from rows) ----------------
+@router.get("/{paper_id}")
+async def get_paper(
+    paper_id: int,
+    principal: dict = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+
+    paper = await get_paper_or_404(db, paper_id, with_questions=True)
+    check_paper_access(principal, paper)
 
-    # ✅ Convert SQLAlchemy objects to dict
-    result = []
-    for paper in papers:
-        result.append({
-            "id": paper.id,
-            "faculty_id": paper.faculty_id,
-            "institute_id": paper.institute_id,
-            "status": paper.status,
-            "content": paper.content,  # keep as JSON string
-        })
+    questions = [question_to_dict(q) for q in paper.questions]  # ordered by position
 
-    return result
+    return json_response({
+        **paper_summary(paper, len(questions)),
+        "questions": questions,
+    })
 
 
 # ---------------- SUBMIT PAPER ----------------
 @router.post("/submit")
-def submit_paper(data: dict, db: Session = Depends(get_db)):
+async def submit_paper(
+    data: dict,
+    principal: dict = Depends(require_roles("faculty")),
+    db: AsyncSession = Depends(get_db)
+):
 
-    import json
-
-    try:
+    async with transaction(db):  # ✅ rollback on error prevents DB lock
         paper = QuestionPaper(
-            content=json.dumps(data["questions"]),
-            faculty_id=data["faculty_id"],
-            institute_id=data["institute_id"],
-            status="pending"
+            title=data.get("title"),
+            # ✅ owner comes from the token, not the request body
+            faculty_id=principal["user_id"],
+            institute_id=principal["institute_id"],
+            status="pending",
+            created_at=utcnow()
         )
 
+        # ✅ one row per question, in the order they were generated
+        paper.questions = [
+            Question(**question_from_dict(q, position, data.get("difficulty")))
+            for position, q in enumerate(data["questions"])
+        ]
+
         db.add(paper)
-        db.commit()
-        db.refresh(paper)
+        await db.flush()
+
+        # 📊 dashboard rollup, same transaction
+        await record_submission(db, paper, len(paper.questions))
+
+    invalidate_dashboard(paper.institute_id)
+
+    return {"message": "Paper sent to COE", "paper_id": paper.id}
+
+
+# ---------------- EDIT ONE QUESTION ----------------
+@router.patch("/{paper_id}/questions/{question_id}")
+async def update_question(
+    paper_id: int,
+    question_id: int,
+    data: QuestionUpdate,
+    principal: dict = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
 
-        return {"message": "Paper sent to COE"}
+    # ✅ explicit nulls on NOT NULL columns are rejected with 422 by the schema
+    fields = question_fields(data.model_dump(exclude_unset=True))
+    if not fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Nothing to update (editable: {', '.join(EDITABLE_FIELDS)})"
+        )
+
+    check_paper_access(principal, await get_paper_or_404(db, paper_id))
+
+    async with transaction(db):
+        # ✅ single row update, the rest of the paper is untouched
+        result = await db.execute(
+            update(Question)
+            .where(Question.id == question_id, Question.paper_id == paper_id)
+            .values(**fields)
+        )
 
-    except Exception as e:
-        db.rollback()  # ✅ prevents DB lock
-        raise e
+        if not result.rowcount:
+            raise HTTPException(status_code=404, detail="Question not found")
 
-from fastapi import HTTPException
+    question = await db.get(Question, question_id, populate_existing=True)
+    return question_to_dict(question)
 
 
 # ---------------- UPDATE STATUS (COE) ----------------
-from fastapi import HTTPException
-from backend.app.models.notification_model import Notification
+def review_notification(paper: QuestionPaper, status: str, remark=None) -> Notification:
+    message = f"Your question paper (ID: {paper.id}) is {status}"
+    if remark:
+        message += f". Remark: {remark}"
+
+    return Notification(
+        faculty_id=paper.faculty_id,
+        message=message,
+        created_at=utcnow()
+    )
+
 
 @router.put("/{paper_id}/status")
-def update_status(paper_id: int, data: dict, db: Session = Depends(get_db)):
+async def update_status(
+    paper_id: int,
+    data: dict,
+    principal: dict = Depends(require_roles("coe", "superadmin")),
+    db: AsyncSession = Depends(get_db)
+):
 
     # 🔍 Find paper
-    paper = db.query(QuestionPaper).filter(
-        QuestionPaper.id == paper_id
-    ).first()
-
-    if not paper:
-        raise HTTPException(status_code=404, detail="Paper not found")
+    paper = await get_paper_or_404(db, paper_id)
+    check_institute(principal, paper.institute_id)
 
     # ✅ Validate status
     status = data.get("status")
-    if status not in ["approved", "rejected"]:
+    if status not in REVIEW_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    try:
+    async with transaction(db):
         # ✅ Update status
+        old_status = paper.status
         paper.status = status
 
         # 🔔 Create notification
-        message = f"Your question paper (ID: {paper.id}) is {status}"
+        notification = review_notification(paper, status, data.get("remark"))
+        db.add(notification)
 
-        notification = Notification(
-            faculty_id=paper.faculty_id,
-            message=message
-        )
+        # 📊 dashboard rollup, same transaction
+        await record_status_changes(db, [(paper, old_status)])
 
-        db.add(notification)
+    invalidate_dashboard(paper.institute_id)
+
+    # 🔔 push to the faculty's open streams (only after commit)
+    notification_bus.publish(paper.faculty_id, notification_to_dict(notification))
+
+    return {"message": f"Paper {status} successfully"}
+
+
+# ---------------- BULK REVIEW (COE) ----------------
+@router.post("/review")
+async def bulk_review(
+    data: dict,
+    principal: dict = Depends(require_roles("coe", "superadmin")),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Body: {"reviews": [{"paper_id": 1, "status": "approved", "remark": "..."}]}
+
+    Valid items are applied together in one transaction; invalid ones are
+    reported per item instead of failing the whole batch.
+    """
+    reviews = data.get("reviews")
+
+    if not isinstance(reviews, list) or not reviews:
+        raise HTTPException(status_code=400, detail="reviews must be a non-empty list")
+    if len(reviews) > BULK_REVIEW_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_REVIEW_MAX_ITEMS} reviews per request")
+
+    # ✅ Validate the shape of every item first
+    results = []
+    wanted = {}
+
+    for item in reviews:
+        item = item if isinstance(item, dict) else {}
+        paper_id = item.get("paper_id")
+        status = item.get("status")
+        result = {"paper_id": paper_id, "status": status, "ok": False}
+        results.append(result)
+
+        if not isinstance(paper_id, int):
+            result["error"] = "Invalid paper_id"
+        elif status not in REVIEW_STATUSES:
+            result["error"] = "Invalid status"
+        elif paper_id in wanted:
+            result["error"] = "Duplicate paper_id"
+        else:
+            wanted[paper_id] = (result, status, item.get("remark"))
+
+    # 🔍 One query for all papers
+    papers = {}
+    if wanted:
+        papers = {
+            paper.id: paper
+            for paper in await db.scalars(
+                select(QuestionPaper).where(QuestionPaper.id.in_(list(wanted)))
+            )
+        }
+
+    changes = []
+    notifications = []
+
+    async with transaction(db):
+        for paper_id, (result, status, remark) in wanted.items():
+            paper = papers.get(paper_id)
+            if paper is None:
+                result["error"] = "Paper not found"
+                continue
+            if not can_access_institute(principal, paper.institute_id):
+                result["error"] = "Not authorized for this institute"
+                continue
+
+            changes.append((paper, paper.status))
+            paper.status = status
+
+            notifications.append(review_notification(paper, status, remark))
+            result["ok"] = True
+
+        db.add_all(notifications)
+
+        # 📊 dashboard rollup, one counter update per institute
+        await record_status_changes(db, changes)
+
+    invalidate_dashboard(*{paper.institute_id for paper, _ in changes})
 
-        # ✅ Save changes
-        db.commit()
-        db.refresh(paper)
+    # 🔔 push after commit
+    for notification in notifications:
+        notification_bus.publish(notification.faculty_id, notification_to_dict(notification))
 
-        return {"message": f"Paper {status} successfully"}
+    updated = sum(1 for result in results if result["ok"])
 
-    except Exception as e:
-        db.rollback()
-        raise e
\ No newline at end of file
+    return {
+        "updated": updated,
+        "failed": len(results) - updated,
+        "results": results
+    }
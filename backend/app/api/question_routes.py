@@ -1,16 +1,43 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse, JSONResponse
 from typing import Optional, List
+import asyncio
 import json
-
-from backend.app.schemas.question_schema import QuestionRequest, QuestionResponse
+import logging
+import math
+import os
+
+from backend.app.schemas.question_schema import (
+    QuestionRequest,
+    QuestionResponse,
+    MCQ,
+    DescriptiveQuestion,
+)
 from backend.app.core.prompt_builder import build_question_prompt
-from backend.app.services.llm_client import generate_questions
-from backend.app.utils.pdf_utils import extract_text_from_pdf
-from backend.app.utils.text_chunker import chunk_text
-from backend.app.utils.image_fetcher import fetch_wikipedia_image
+from backend.app.services.llm_client import generate_questions, stream_questions
+from backend.app.services.llm_cache import get_llm_cache
+from backend.app.services.llm_providers import LLMProviderError
+from backend.app.services.job_queue import job_queue, register_job_handler
+from backend.app.utils.pdf_utils import iter_selected_pages
+from backend.app.utils.text_chunker import chunk_pages
+from backend.app.utils.chunk_ranker import chunks_needed, select_chunks
+from backend.app.utils.question_dedup import QuestionDeduplicator
+from backend.app.utils.image_fetcher import fetch_images
+from backend.app.utils.json_stream import JSONArrayStreamParser
+from backend.app.utils.json_response import json_response
+from backend.app.core.metrics import GENERATION_STAGE_SECONDS, timed
+from backend.app.core.logger import log_payload
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# Max number of chunk prompts sent to the LLM at the same time
+PDF_CHUNK_CONCURRENCY = max(1, int(os.getenv("PDF_CHUNK_CONCURRENCY", "4")))
+
+# Extra LLM calls allowed to replace questions dropped as duplicates
+DEDUP_TOPUP_ROUNDS = int(os.getenv("DEDUP_TOPUP_ROUNDS", "1"))
+
 # -----------------------------------------
 # SAFE JSON PARSER
 # -----------------------------------------
@@ -48,9 +75,12 @@ def safe_json_loads(raw: str):
 # -----------------------------------------
 # ATTACH IMAGE TO QUESTIONS
 # -----------------------------------------
-def attach_images(questions, topic=None):
-
-    print("\n===== ATTACH IMAGE DEBUG =====")
+async def attach_images(questions, topic=None):
+    """
+    Look up one image per question. All entities are resolved together:
+    cached answers first, then batched / concurrent Wikipedia calls.
+    """
+    entities = []
 
     for q in questions:
         entity = None
@@ -60,18 +90,155 @@ def attach_images(questions, topic=None):
         elif "question" in q:
             entity = " ".join(q["question"].split(" ")[0:3])
 
-        print("Trying entity:", entity)
+        entities.append(entity)
+
+    images = await fetch_images([e for e in entities if e])
+
+    attached = 0
+    for q, entity in zip(questions, entities):
+        image_url = images.get(entity) if entity else None
+
+        if image_url:
+            q["image_url"] = image_url
+            attached += 1
+
+    logger.debug("images attached", extra={"attached": attached, "questions": len(questions)})
+
+    return questions
+
+
+# -----------------------------------------
+# PDF TEXT EXTRACTION
+# -----------------------------------------
+async def read_pdf_chunks(pdf_bytes: bytes, start_page=None, end_page=None, chapter=None):
+    """
+    Extract the selected pages of the PDF and pack them into
+    sentence-aligned chunks, off the event loop.
+    """
+    def extract_and_chunk():
+        # ✅ sequential pages stream straight into the chunker (never all in memory)
+        pages = iter_selected_pages(
+            pdf_bytes,
+            start_page=start_page,
+            end_page=end_page,
+            chapter=chapter
+        )
+        return chunk_pages(pages)
+
+    try:
+        return await asyncio.to_thread(extract_and_chunk)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# -----------------------------------------
+# CHUNK SELECTION
+# -----------------------------------------
+def parse_keywords(keywords: Optional[str]):
+    if not keywords:
+        return None
+    return [k.strip() for k in keywords.split(",") if k.strip()] or None
+
+
+def plan_chunks(chunks, num_questions, topic=None, keywords=None):
+    """
+    Pick the chunks worth sending to the LLM and how many questions to
+    ask of each. Returns (chunk_texts, per_chunk), best chunk first.
+    """
+    needed = chunks_needed(num_questions, len(chunks))
+
+    # one spare chunk covers a reply that fails to parse
+    selected = select_chunks(
+        chunks,
+        min(len(chunks), needed + 1),
+        topic=topic,
+        keywords=keywords
+    )
+
+    # near-duplicate documents can leave fewer chunks than planned
+    per_chunk = math.ceil(num_questions / max(1, min(needed, len(selected))))
+    return [chunk["text"] for chunk in selected], per_chunk
+
+
+# -----------------------------------------
+# CONCURRENT CHUNK GENERATION
+# -----------------------------------------
+async def generate_for_chunks(
+    chunks,
+    per_chunk,
+    num_questions,
+    difficulty,
+    question_type,
+    concurrency=PDF_CHUNK_CONCURRENCY,
+    use_cache=True,
+    model=None,
+    topic=None,
+    keywords=None,
+    deduper=None,
+    avoid_questions=None,
+    on_progress=None
+):
+    """
+    Send chunk prompts to the LLM in parallel (at most `concurrency` at a
+    time) and merge the parsed questions in chunk order.
+
+    Results are consumed in chunk order, so the output is the same as the
+    old sequential loop. When a `deduper` is given, near-duplicates are
+    dropped while merging. Once enough questions are collected, chunks
+    that have not started yet are cancelled.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_chunk(chunk):
+        async with semaphore:
+            with timed(GENERATION_STAGE_SECONDS, "pdf", "prompt_build"):
+                prompt = build_question_prompt(
+                    num_questions=per_chunk,
+                    difficulty=difficulty,
+                    content=chunk,
+                    topic=topic,
+                    keywords=keywords,
+                    question_type=question_type,
+                    avoid_questions=avoid_questions
+                )
+
+            raw = await generate_questions(
+                prompt, use_cache=use_cache, model=model
+            )
+
+        log_payload(logger, "raw llm output", raw, pipeline="pdf")
+
+        try:
+            with timed(GENERATION_STAGE_SECONDS, "pdf", "parse"):
+                return safe_json_loads(raw)
+        except Exception:
+            return []
+
+    tasks = [asyncio.create_task(run_chunk(chunk)) for chunk in chunks]
+    questions = []
+
+    try:
+        for task in tasks:
+            try:
+                parsed = await task
+            except Exception:
+                continue
+
+            if deduper is not None:
+                parsed = deduper.filter(parsed)
 
-        if entity:
-            image_url = fetch_wikipedia_image(entity)
+            questions.extend(parsed)
 
-            if image_url:
-                print("Image attached:", image_url)
-                q["image_url"] = image_url
-            else:
-                print("No image found")
+            if on_progress is not None:
+                await on_progress(min(len(questions), num_questions))
 
-    print("===== ATTACH IMAGE DONE =====\n")
+            if len(questions) >= num_questions:
+                break
+    finally:
+        # ✅ stop outstanding calls once we have enough (or on error)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
     return questions
 
@@ -79,8 +246,18 @@ def attach_images(questions, topic=None):
 # =================================================
 # TEXT / CONTENT / TOPIC BASED GENERATION
 # =================================================
-@router.post("/generate-questions", response_model=QuestionResponse)
-def generate(req: QuestionRequest):
+# QuestionResponse documents the shape; results are not re-validated through it
+@router.post("/generate-questions", responses={200: {"model": QuestionResponse}})
+async def generate(req: QuestionRequest):
+
+    # ✅ BACKGROUND JOB MODE
+    if req.async_job:
+        return await submit_job("text", req.model_dump(exclude={"async_job"}))
+
+    return json_response(await run_text_generation(req))
+
+
+async def run_text_generation(req: QuestionRequest, progress=None):
 
     # ✅ SAFE DEFAULTS
     topic = req.topic or None
@@ -92,6 +269,7 @@ def generate(req: QuestionRequest):
     difficulty = req.difficulty or "medium"
     question_type = req.question_type or "descriptive"
     include_images = req.include_images or False
+    force_fresh = req.force_fresh or False
 
     # ✅ VALIDATION
     if not (topic or content or keywords):
@@ -101,45 +279,100 @@ def generate(req: QuestionRequest):
         )
 
     # ✅ BUILD PROMPT
-    prompt = build_question_prompt(
-        num_questions=num_questions,
-        difficulty=difficulty,
-        topic=topic,
-        content=content,
-        keywords=keywords,
-        question_type=question_type
-    )
+    with timed(GENERATION_STAGE_SECONDS, "text", "prompt_build"):
+        prompt = build_question_prompt(
+            num_questions=num_questions,
+            difficulty=difficulty,
+            topic=topic,
+            content=content,
+            keywords=keywords,
+            question_type=question_type
+        )
 
     # ✅ CALL LLM
-    raw = generate_questions(prompt)
+    if progress is not None:
+        await progress(10, "generating")
 
-    print("\n--- RAW LLM OUTPUT ---\n", raw, "\n---------------------\n")
+    try:
+        with timed(GENERATION_STAGE_SECONDS, "text", "llm"):
+            raw = await generate_questions(
+                prompt, use_cache=not force_fresh, model=req.model
+            )
+    except LLMProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    log_payload(logger, "raw llm output", raw, pipeline="text")
 
     try:
-        questions = safe_json_loads(raw)
+        with timed(GENERATION_STAGE_SECONDS, "text", "parse"):
+            questions = safe_json_loads(raw)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to parse LLM output: {str(e)}"
         )
 
+    # ✅ DROP NEAR-DUPLICATES (within the reply and vs. excluded questions)
+    with timed(GENERATION_STAGE_SECONDS, "text", "dedup"):
+        deduper = QuestionDeduplicator(exclude=req.exclude_questions)
+        questions = deduper.filter(questions)
+
+    # ✅ TOP UP: ask only for the shortfall
+    for _ in range(DEDUP_TOPUP_ROUNDS):
+        shortfall = num_questions - len(questions)
+        if shortfall <= 0:
+            break
+
+        prompt = build_question_prompt(
+            num_questions=shortfall,
+            difficulty=difficulty,
+            topic=topic,
+            content=content,
+            keywords=keywords,
+            question_type=question_type,
+            avoid_questions=deduper.accepted
+        )
+
+        try:
+            with timed(GENERATION_STAGE_SECONDS, "text", "topup"):
+                raw = await generate_questions(
+                    prompt, use_cache=not force_fresh, model=req.model
+                )
+                questions.extend(deduper.filter(safe_json_loads(raw)))
+        except Exception:
+            break
+
+    questions = questions[:num_questions]
+
     # ✅ OPTIONAL IMAGE ATTACHMENT
     if include_images:
-        questions = attach_images(questions, topic=topic)
+        if progress is not None:
+            await progress(90, "attaching images")
+        with timed(GENERATION_STAGE_SECONDS, "text", "images"):
+            questions = await attach_images(questions, topic=topic)
 
-    return {"questions": questions}
+    return {"questions": questions, "duplicates_removed": deduper.removed}
 
 
 # =================================================
 # PDF BASED QUESTION GENERATION
 # =================================================
-@router.post("/generate-questions-from-pdf", response_model=QuestionResponse)
+@router.post("/generate-questions-from-pdf", responses={200: {"model": QuestionResponse}})
 async def generate_from_pdf(
     file: UploadFile = File(...),
     num_questions: int = 10,
     difficulty: str = "medium",
     question_type: str = "descriptive",
-    include_images: bool = False
+    include_images: bool = False,
+    force_fresh: bool = False,
+    model: Optional[str] = None,
+    start_page: Optional[int] = None,
+    end_page: Optional[int] = None,
+    chapter: Optional[str] = None,
+    topic: Optional[str] = None,
+    keywords: Optional[str] = None,
+    exclude_questions: Optional[List[str]] = Query(None),
+    async_job: bool = False
 ):
 
     if not file.filename.lower().endswith(".pdf"):
@@ -148,43 +381,335 @@ async def generate_from_pdf(
             detail="Only PDF files allowed"
         )
 
-    # ✅ Extract text
-    text = extract_text_from_pdf(await file.read())
+    params = {
+        "num_questions": num_questions,
+        "difficulty": difficulty,
+        "question_type": question_type,
+        "include_images": include_images,
+        "force_fresh": force_fresh,
+        "model": model,
+        "start_page": start_page,
+        "end_page": end_page,
+        "chapter": chapter,
+        "topic": topic,
+        "keywords": keywords,
+        "exclude_questions": exclude_questions,
+    }
+    pdf_bytes = await file.read()
+
+    # ✅ BACKGROUND JOB MODE
+    if async_job:
+        return await submit_job("pdf", params, pdf_bytes)
+
+    return json_response(await run_pdf_generation(pdf_bytes, **params))
+
+
+async def run_pdf_generation(
+    pdf_bytes: bytes,
+    num_questions: int = 10,
+    difficulty: str = "medium",
+    question_type: str = "descriptive",
+    include_images: bool = False,
+    force_fresh: bool = False,
+    model=None,
+    start_page=None,
+    end_page=None,
+    chapter=None,
+    topic=None,
+    keywords=None,
+    exclude_questions=None,
+    progress=None
+):
 
-    # ✅ Chunk text
-    chunks = chunk_text(text)
+    async def report(percent, stage):
+        if progress is not None:
+            await progress(percent, stage)
 
-    questions = []
+    # ✅ Extract text (only the requested pages) and chunk by sentences
+    await report(5, "extracting text")
+    with timed(GENERATION_STAGE_SECONDS, "pdf", "pdf_extract"):
+        chunks = await read_pdf_chunks(pdf_bytes, start_page, end_page, chapter)
 
-    # distribute questions across chunks
-    per_chunk = max(1, num_questions // len(chunks))
+    if not chunks:
+        raise HTTPException(
+            status_code=400,
+            detail="No text could be extracted from the PDF"
+        )
 
-    for chunk in chunks:
+    # ✅ only the most relevant, non-duplicate chunks go to the LLM
+    keyword_list = parse_keywords(keywords)
+    with timed(GENERATION_STAGE_SECONDS, "pdf", "chunk_select"):
+        texts, per_chunk = plan_chunks(chunks, num_questions, topic, keyword_list)
 
-        prompt = build_question_prompt(
+    deduper = QuestionDeduplicator(exclude=exclude_questions)
+
+    async def on_progress(done):
+        await report(10 + 80 * done // max(1, num_questions), "generating")
+
+    await report(10, "generating")
+    with timed(GENERATION_STAGE_SECONDS, "pdf", "llm"):
+        questions = await generate_for_chunks(
+            texts,
+            per_chunk=per_chunk,
+            num_questions=num_questions,
+            difficulty=difficulty,
+            question_type=question_type,
+            use_cache=not force_fresh,
+            model=model,
+            topic=topic,
+            keywords=keyword_list,
+            deduper=deduper,
+            on_progress=on_progress
+        )
+
+    # ✅ TOP UP: ask the best chunk for the shortfall only
+    for _ in range(DEDUP_TOPUP_ROUNDS):
+        shortfall = num_questions - len(questions)
+        if shortfall <= 0:
+            break
+
+        with timed(GENERATION_STAGE_SECONDS, "pdf", "topup"):
+            questions += await generate_for_chunks(
+                texts[:1],
+                per_chunk=shortfall,
+                num_questions=shortfall,
+                difficulty=difficulty,
+                question_type=question_type,
+                use_cache=not force_fresh,
+                model=model,
+                topic=topic,
+                keywords=keyword_list,
+                deduper=deduper,
+                avoid_questions=deduper.accepted
+            )
+
+    questions = questions[:num_questions]
+
+    # ✅ OPTIONAL IMAGE ATTACHMENT
+    if include_images:
+        await report(90, "attaching images")
+        with timed(GENERATION_STAGE_SECONDS, "pdf", "images"):
+            questions = await attach_images(questions)
+
+    return {"questions": questions, "duplicates_removed": deduper.removed}
+
+
+# =================================================
+# STREAMING GENERATION (NDJSON)
+# =================================================
+def ndjson_line(event: dict) -> str:
+    return json.dumps(event) + "\n"
+
+
+async def stream_parsed_questions(
+    prompts,
+    num_questions,
+    question_type,
+    include_images=False,
+    topic=None,
+    use_cache=True,
+    model=None,
+    exclude_questions=None
+):
+    """
+    Run prompts one after another through the streaming LLM call and yield
+    one NDJSON event per question as soon as its JSON object is complete.
+
+    Events:
+      {"type": "question", "index": i, "question": {...}}
+      {"type": "error", "detail": "..."}
+      {"type": "done", "count": n, "duplicates_removed": d}
+
+    Near-duplicates of earlier questions (or of `exclude_questions`) are
+    skipped before they are sent.
+    """
+    schema = MCQ if question_type == "mcq" else DescriptiveQuestion
+    deduper = QuestionDeduplicator(exclude=exclude_questions)
+    count = 0
+
+    try:
+        for prompt in prompts:
+            parser = JSONArrayStreamParser()
+
+            pieces = stream_questions(prompt, use_cache=use_cache, model=model)
+
+            try:
+                async for piece in pieces:
+                    for obj in parser.feed(piece):
+                        try:
+                            question = schema(**obj).model_dump()
+                        except Exception:
+                            continue
+
+                        if not deduper.add(question["question"]):
+                            continue
+
+                        if include_images:
+                            question = (await attach_images([question], topic))[0]
+
+                        yield ndjson_line({
+                            "type": "question",
+                            "index": count,
+                            "question": question
+                        })
+                        count += 1
+
+                        if count >= num_questions:
+                            break
+
+                    if count >= num_questions:
+                        break
+            finally:
+                # ✅ close the LLM stream if we stopped early
+                await pieces.aclose()
+
+            if count >= num_questions:
+                break
+
+    except Exception as e:
+        yield ndjson_line({"type": "error", "detail": str(e)})
+
+    yield ndjson_line({
+        "type": "done",
+        "count": count,
+        "duplicates_removed": deduper.removed
+    })
+
+
+@router.post("/generate-questions/stream")
+def generate_stream(req: QuestionRequest):
+
+    topic = req.topic or None
+    content = req.content or None
+    keywords = req.keywords or None
+
+    num_questions = min(req.num_questions or 5, 5)  # ✅ same limit as /generate-questions
+    difficulty = req.difficulty or "medium"
+    question_type = req.question_type or "descriptive"
+
+    if not (topic or content or keywords):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide at least topic or content or keywords"
+        )
+
+    prompt = build_question_prompt(
+        num_questions=num_questions,
+        difficulty=difficulty,
+        topic=topic,
+        content=content,
+        keywords=keywords,
+        question_type=question_type
+    )
+
+    return StreamingResponse(
+        stream_parsed_questions(
+            [prompt],
+            num_questions=num_questions,
+            question_type=question_type,
+            include_images=req.include_images or False,
+            topic=topic,
+            use_cache=not (req.force_fresh or False),
+            model=req.model,
+            exclude_questions=req.exclude_questions
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/generate-questions-from-pdf/stream")
+async def generate_from_pdf_stream(
+    file: UploadFile = File(...),
+    num_questions: int = 10,
+    difficulty: str = "medium",
+    question_type: str = "descriptive",
+    include_images: bool = False,
+    force_fresh: bool = False,
+    model: Optional[str] = None,
+    start_page: Optional[int] = None,
+    end_page: Optional[int] = None,
+    chapter: Optional[str] = None,
+    topic: Optional[str] = None,
+    keywords: Optional[str] = None,
+    exclude_questions: Optional[List[str]] = Query(None)
+):
+
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files allowed"
+        )
+
+    chunks = await read_pdf_chunks(await file.read(), start_page, end_page, chapter)
+
+    if not chunks:
+        raise HTTPException(
+            status_code=400,
+            detail="No text could be extracted from the PDF"
+        )
+
+    keyword_list = parse_keywords(keywords)
+    texts, per_chunk = plan_chunks(chunks, num_questions, topic, keyword_list)
+
+    # prompts are built lazily so unused chunks cost nothing
+    prompts = (
+        build_question_prompt(
             num_questions=per_chunk,
             difficulty=difficulty,
-            content=chunk,
+            content=text,
+            topic=topic,
+            keywords=keyword_list,
             question_type=question_type
         )
+        for text in texts
+    )
 
-        raw = generate_questions(prompt)
+    return StreamingResponse(
+        stream_parsed_questions(
+            prompts,
+            num_questions=num_questions,
+            question_type=question_type,
+            include_images=include_images,
+            use_cache=not force_fresh,
+            model=model,
+            exclude_questions=exclude_questions
+        ),
+        media_type="application/x-ndjson"
+    )
 
-        print("\n--- RAW LLM OUTPUT ---\n", raw, "\n---------------------\n")
 
-        try:
-            parsed = safe_json_loads(raw)
-            questions.extend(parsed)
-        except Exception:
-            continue
+# =================================================
+# BACKGROUND JOBS
+# =================================================
+async def submit_job(kind: str, params: dict, payload: bytes | None = None):
+    job_id = await job_queue.submit(kind, params, payload)
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/jobs/{job_id}",
+            "events_url": f"/jobs/{job_id}/events"
+        }
+    )
 
-        if len(questions) >= num_questions:
-            break
 
-    questions = questions[:num_questions]
+async def _text_job(params, payload, progress):
+    return await run_text_generation(QuestionRequest(**params), progress=progress)
 
-    # ✅ OPTIONAL IMAGE ATTACHMENT
-    if include_images:
-        questions = attach_images(questions)
 
-    return {"questions": questions}
\ No newline at end of file
+async def _pdf_job(params, payload, progress):
+    return await run_pdf_generation(payload, **params, progress=progress)
+
+
+register_job_handler("text", _text_job)
+register_job_handler("pdf", _pdf_job)
+
+
+# =================================================
+# LLM CACHE STATS
+# =================================================
+@router.get("/llm-cache/stats")
+def llm_cache_stats():
+    return get_llm_cache().stats()
@@ -0,0 +1,212 @@
+"""
+Structured logging that never blocks a request on stdout.
+
+Records go through a bounded in-memory queue to one background thread,
+which formats them as JSON lines, one per record. When the queue is full,
+records are dropped and counted instead of making the caller wait. Every
+record carries the id of the request it was logged from.
+
+    logger = logging.getLogger(__name__)
+    logger.info("user created", extra={"user_id": 7, "role": "faculty"})
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+
+from backend.app.core.metrics import Counter
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json / text (local dev)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# fraction of requests whose verbose payloads (raw LLM output) are logged at INFO
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "4000"))
+
+# client libraries that log every outbound call at INFO
+QUIET_LOGGERS = ("httpx", "httpcore")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+payload_sampled_var = contextvars.ContextVar("payload_sampled", default=False)
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+# attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+# -------------------------------------------------
+# FORMAT / FILTER / HANDLER
+# -------------------------------------------------
+class RequestIdFilter(logging.Filter):
+    """Runs in the logging thread's caller, where the request context is visible."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                  + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # render args and traceback now (they may not survive the thread hop),
+        # but keep the message and traceback apart for the JSON formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener = None
+_handler = None
+
+
+def setup_logging(level=LOG_LEVEL, fmt=LOG_FORMAT):
+    """Route the root logger through the queue; safe to call more than once."""
+    global _listener, _handler
+
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(
+        JSONFormatter() if fmt == "json"
+        else logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+    )
+
+    _handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_handler)
+
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(max(logging.WARNING, root.level))
+
+    _listener = logging.handlers.QueueListener(_handler.queue, stream)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush whatever is still queued (shutdown / exit)."""
+    global _listener, _handler
+
+    if _listener is not None:
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        _listener = _handler = None
+
+
+# -------------------------------------------------
+# VERBOSE PAYLOADS (sampled)
+# -------------------------------------------------
+def log_payload(logger: logging.Logger, msg: str, payload: str, **fields):
+    """
+    Log a large debug payload: always at DEBUG, otherwise only for the
+    sampled fraction of requests (LOG_PAYLOAD_SAMPLE_RATE), truncated.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        level = logging.DEBUG
+    elif payload_sampled_var.get() and logger.isEnabledFor(logging.INFO):
+        level = logging.INFO
+    else:
+        return
+
+    if payload and len(payload) > LOG_PAYLOAD_MAX_CHARS:
+        fields["truncated_from"] = len(payload)
+        payload = payload[:LOG_PAYLOAD_MAX_CHARS]
+
+    logger.log(level, msg, extra={**fields, "payload": payload})
+
+
+# -------------------------------------------------
+# REQUEST CONTEXT MIDDLEWARE
+# -------------------------------------------------
+class RequestContextMiddleware:
+    """
+    Request id from the client's X-Request-ID (or a new one), echoed on the
+    response and attached to every record logged while serving it. Also
+    decides once per request whether verbose payloads are sampled.
+    """
+
+    def __init__(self, app, sample_rate=LOG_PAYLOAD_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+
+        id_token = request_id_var.set(request_id)
+        sample_token = payload_sampled_var.set(random.random() < self.sample_rate)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER.lower().encode(), request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(id_token)
+            payload_sampled_var.reset(sample_token)
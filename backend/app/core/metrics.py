@@ -0,0 +1,257 @@
+"""
+In-process Prometheus metrics: counters, gauges and fixed-bucket histograms
+kept in plain dicts behind a lock, rendered in the text exposition format
+by GET /metrics. Values are per worker process.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# seconds; generation stages run from milliseconds (parsing) to a minute (LLM)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra="") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _samples(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for labels, value in self._samples():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class CallbackGauge(Metric):
+    """Gauge read at scrape time from `fn()` → {label values tuple: value}."""
+
+    type = "gauge"
+
+    def __init__(self, name, help, fn, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+
+    def _samples(self):
+        try:
+            return sorted(self.fn().items())
+        except Exception:
+            return []
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # per-bucket (non-cumulative) counts, +Inf last; sum; count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        with self._lock:
+            return sorted(
+                (labels, (list(counts), total, count))
+                for labels, (counts, total, count) in self._values.items()
+            )
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+        for labels, (counts, total, count) in self._samples():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+
+            label_text = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_number(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+
+        return lines
+
+
+@contextmanager
+def timed(histogram: Histogram, *labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, *labels)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+# APPLICATION METRICS
+# -------------------------------------------------
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served (SSE streams included)"
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP responses by route template and status",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time until the response finished", ("method", "route")
+)
+
+GENERATION_STAGE_SECONDS = Histogram(
+    "generation_stage_duration_seconds", "Question generation pipeline stages",
+    ("pipeline", "stage")
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Provider completions (cache hits excluded)",
+    ("provider", "model", "outcome")
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens reported by the provider", ("provider", "model", "kind")
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by result (hit / miss / bypass)", ("cache", "result")
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("operation",),
+    buckets=DB_BUCKETS
+)
+
+
+# -------------------------------------------------
+# HTTP MIDDLEWARE
+# -------------------------------------------------
+class MetricsMiddleware:
+    """In-flight gauge plus per-route counts and latency (route template, not raw path)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+            route = scope.get("route")
+            # unmatched paths share one label so scanners cannot blow up cardinality
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+
+            HTTP_REQUESTS.inc(method, template, str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, template)
+
+
+# -------------------------------------------------
+# SQLALCHEMY HOOKS
+# -------------------------------------------------
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "CREATE", "ALTER"}
+
+
+def instrument_engine(sync_engine):
+    """Time every statement on `sync_engine` (for async engines pass .sync_engine)."""
+    from sqlalchemy import event
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        DB_QUERY_SECONDS.observe(
+            time.perf_counter() - start,
+            operation if operation in SQL_OPERATIONS else "OTHER"
+        )
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+import time
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+
+from backend.app.core.security import verify_token
+from backend.app.db.database import AsyncSessionLocal
+from backend.app.models.user_model import User
+from backend.app.utils.ttl_cache import TTLCache
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+# how often each worker re-reads deactivated users (other workers' changes)
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+# token → decoded principal; skips signature checks for repeat requests
+principal_cache = TTLCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES, name="principal")
+
+
+def token_claims(user: User) -> dict:
+    return {
+        "sub": str(user.id),
+        "role": user.role,
+        "institute_id": user.institute_id,
+    }
+
+
+# -------------------------------------------------
+# REVOCATION LIST (is_active = False)
+# -------------------------------------------------
+class RevocationList:
+    def __init__(self):
+        self._user_ids = set()
+        self._task = None
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._user_ids
+
+    def revoke(self, user_id: int):
+        self._user_ids.add(user_id)
+
+    def restore(self, user_id: int):
+        self._user_ids.discard(user_id)
+
+    async def refresh(self):
+        async with AsyncSessionLocal() as db:
+            rows = await db.scalars(select(User.id).where(User.is_active.is_(False)))
+            self._user_ids = set(rows.all())
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(REVOCATION_REFRESH_SECONDS)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("revocation list refresh failed")
+
+    async def start(self):
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+revoked_users = RevocationList()
+
+
+# -------------------------------------------------
+# DEPENDENCIES
+# -------------------------------------------------
+def _request_token(request: Request):
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token
+
+    # EventSource cannot set headers: SSE clients pass the token in the URL
+    return request.query_params.get("access_token")
+
+
+async def get_current_principal(request: Request) -> dict:
+    """
+    {"user_id", "role", "institute_id"} from the bearer token; no database
+    access. Deactivated users are rejected through the revocation list.
+    Async (nothing here blocks) so FastAPI runs it on the event loop
+    instead of hopping to the threadpool on every authenticated request.
+    """
+    token = _request_token(request)
+    if not token:
+        raise HTTPException(401, "Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+    found, principal = principal_cache.get(token)
+
+    if not found or principal["exp"] <= time.time():
+        claims = verify_token(token)
+        principal = {
+            "user_id": int(claims["sub"]),
+            "role": claims.get("role"),
+            "institute_id": claims.get("institute_id"),
+            "exp": claims["exp"],
+        }
+        principal_cache.set(token, principal)
+
+    if principal["user_id"] in revoked_users:
+        raise HTTPException(401, "Account disabled")
+
+    return principal
+
+
+def require_roles(*roles):
+    async def dependency(principal: dict = Depends(get_current_principal)) -> dict:
+        if principal["role"] not in roles:
+            raise HTTPException(403, "Not authorized")
+        return principal
+
+    return dependency
+
+
+def can_access_institute(principal: dict, institute_id) -> bool:
+    return principal["role"] == "superadmin" or principal["institute_id"] == institute_id
+
+
+def check_institute(principal: dict, institute_id):
+    if not can_access_institute(principal, institute_id):
+        raise HTTPException(403, "Not authorized for this institute")
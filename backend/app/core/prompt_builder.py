@@ -1,19 +1,29 @@
+from backend.app.utils.text_chunker import CHUNK_MAX_TOKENS, truncate_to_tokens
+
+
 def build_question_prompt(
     num_questions: int,
     difficulty: str,
     topic: str | None = None,
     content: str | None = None,
     keywords: list[str] | None = None,
-    question_type: str = "descriptive"
+    question_type: str = "descriptive",
+    avoid_questions: list[str] | None = None
 ) -> str:
 
     base_context = ""
     if topic:
         base_context += f"\nTOPIC: {topic}"
     if content:
-        base_context += f"\nCONTENT:\n{content[:1500]}"  # ✅ limit size
+        # ✅ limit size to the same token budget the chunker packs to,
+        # so PDF chunks pass through whole
+        base_context += f"\nCONTENT:\n{truncate_to_tokens(content, CHUNK_MAX_TOKENS)}"
     if keywords:
         base_context += f"\nFOCUS KEYWORDS: {', '.join(keywords)}"
+    if avoid_questions:
+        # ✅ used when topping up after duplicates were removed
+        avoid = "\n".join(f"- {q}" for q in avoid_questions[:25])
+        base_context += f"\nDO NOT REPEAT OR PARAPHRASE THESE QUESTIONS:\n{avoid}"
 
     # 🔥 GLOBAL RULES (VERY IMPORTANT)
     strict_rules = """
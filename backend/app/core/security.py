@@ -1,14 +1,218 @@
+import asyncio
+import logging
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# bcrypt work factor; raising it makes existing hashes "need update" and
+# they are re-hashed transparently on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt releases the GIL, so a few threads hash in parallel on a multi-core box
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# waiting jobs beyond this are turned away with 503 instead of piling up
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+MAX_PASSWORD_BYTES = 72  # bcrypt ignores anything longer
+
+# JWT Configuration
+# the token is the only source of identity and role: there is no built-in key
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
+# local development only: sign with a random per-process key (tokens die on restart)
+JWT_DEV_RANDOM_SECRET = os.getenv("JWT_DEV_RANDOM_SECRET", "0") == "1"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+
+
+# the old hard-coded default is public, so it is as good as no key
+_PUBLIC_DEFAULT_KEYS = {"your-secret-key-change-this-in-production"}
+
+if not SECRET_KEY or SECRET_KEY in _PUBLIC_DEFAULT_KEYS:
+    if not JWT_DEV_RANDOM_SECRET:
+        raise RuntimeError(
+            "JWT_SECRET_KEY is unset or the old public default. Set it to a long random value "
+            "(e.g. `python -c \"import secrets; print(secrets.token_urlsafe(48))\"`), "
+            "or JWT_DEV_RANDOM_SECRET=1 for local development."
+        )
+
+    SECRET_KEY = secrets.token_urlsafe(48)
+    logger.warning("JWT_SECRET_KEY not set: using a random development key")
 
 
-def hash_password(password: str):
+def make_password_context(rounds: int = BCRYPT_ROUNDS) -> CryptContext:
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        # hashes with any other cost report needs_update()
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+
+pwd_context = make_password_context()
+
+
+# -------------------------------------------------
+# PASSWORDS (blocking, CPU-bound)
+# -------------------------------------------------
+def hash_password(password: str, context: CryptContext = pwd_context):
     # 🔥 CRITICAL FIX
-    password = password[:72]
-    return pwd_context.hash(password)
+    password = password[:MAX_PASSWORD_BYTES]
+    return context.hash(password)
+
+
+def verify_password(plain, hashed, context: CryptContext = pwd_context):
+    plain = plain[:MAX_PASSWORD_BYTES]
+    return context.verify(plain, hashed)
+
+
+def needs_rehash(hashed, context: CryptContext = pwd_context) -> bool:
+    return context.needs_update(hashed)
+
+
+# -------------------------------------------------
+# BOUNDED HASHING EXECUTOR
+# -------------------------------------------------
+class PasswordHasher:
+    """
+    Runs bcrypt on its own small thread pool so a login burst cannot take
+    over the default threadpool or the event loop, and rejects work once
+    too many calls are already waiting.
+    """
+
+    def __init__(self, workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE,
+                 context: CryptContext = pwd_context):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.context = context
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _timed(self, queued_at, fn, *args):
+        started = time.perf_counter()
+        with self._lock:
+            self.waiting -= 1
+            self.running += 1
+            self.wait_seconds += started - queued_at
+
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.run_seconds += time.perf_counter() - started
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many logins in progress, please retry",
+                    headers={"Retry-After": "1"}
+                )
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+        future = self._get_executor().submit(self._timed, time.perf_counter(), fn, *args)
+        # cancelled before a worker picked it up (client gone, timeout,
+        # shutdown): _timed never runs, so free the queue slot here
+        future.add_done_callback(self._release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _release_if_cancelled(self, future):
+        if future.cancelled():
+            with self._lock:
+                self.waiting -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password, self.context)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self.run(verify_password, plain, hashed, self.context)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.workers,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "waiting": self.waiting,
+                "running": self.running,
+                "max_waiting": self.max_waiting,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.wait_seconds / done * 1000, 2),
+                "avg_run_ms": round(self.run_seconds / done * 1000, 2),
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+# -------------------------------------------------
+# JWT
+# -------------------------------------------------
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    """Create JWT access token"""
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    to_encode.update({"exp": expire})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def verify_password(plain, hashed):
-    plain = plain[:72]
-    return pwd_context.verify(plain, hashed)
\ No newline at end of file
+def verify_token(token: str) -> dict:
+    """Verify JWT token and return payload"""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired"
+        )
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
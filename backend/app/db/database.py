@@ -1,16 +1,125 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./users.db"
+from backend.app.core.metrics import instrument_engine
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={
-        "check_same_thread": False,
-        "timeout": 30  # ✅ prevents lock crashes
-    },
-    pool_pre_ping=True  # ✅ handles stale connections
-)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./users.db")
+
+# Render / Heroku style URLs use the old "postgres://" scheme
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = "postgresql://" + DATABASE_URL[len("postgres://"):]
+
+# pin the sync driver that requirements.txt installs (SQLAlchemy's default
+# for a bare "postgresql://" differs between releases)
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = "postgresql+psycopg2://" + DATABASE_URL[len("postgresql://"):]
+
+
+# async driver per backend; any sync driver in the URL (+psycopg2, +pysqlite) is replaced
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def to_async_url(url: str) -> str:
+    """Same database, async driver (aiosqlite / asyncpg)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+
+    if driver is None or parsed.get_driver_name() == driver:
+        return url
+
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# ---------------- SQLITE PROFILE ----------------
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+# ---------------- SERVER DB POOL ----------------
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def apply_sqlite_pragmas(engine, journal_mode=SQLITE_JOURNAL_MODE):
+    """Run the SQLite tuning PRAGMAs on every new DBAPI connection."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL: readers no longer block behind the single writer
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        # NORMAL is durable across app crashes in WAL mode, with far fewer fsyncs
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")  # negative → KiB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+def make_async_engine(url: str = ASYNC_DATABASE_URL, journal_mode=SQLITE_JOURNAL_MODE):
+    if is_sqlite(url):
+        engine = create_async_engine(
+            url,
+            connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            pool_pre_ping=True
+        )
+        # connect events live on the sync facade of the async engine
+        apply_sqlite_pragmas(engine.sync_engine, journal_mode)
+        return engine
+
+    return create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+
+def make_engine(url: str = DATABASE_URL, journal_mode=SQLITE_JOURNAL_MODE):
+    if is_sqlite(url):
+        engine = create_engine(
+            url,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000  # ✅ prevents lock crashes
+            },
+            pool_pre_ping=True  # ✅ handles stale connections
+        )
+        apply_sqlite_pragmas(engine, journal_mode)
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+
+# sync engine: migrations, background jobs and scripts
+engine = make_engine()
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -18,4 +127,14 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
-Base = declarative_base()
\ No newline at end of file
+# async engine: request handlers (see backend.app.db.session)
+async_engine = make_async_engine()
+instrument_engine(async_engine.sync_engine)  # ✅ db_query_duration_seconds
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False  # objects stay readable after commit without a reload
+)
+
+Base = declarative_base()
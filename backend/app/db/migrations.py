@@ -0,0 +1,160 @@
+"""
+Versioned schema migrations, applied once and in version order. Version 0
+creates the tables; later versions bring databases created before a model
+change up to date. Applied versions are recorded in `schema_migrations`.
+
+Run once per deploy, before the app starts:
+
+    python -m backend.app.db.migrations
+"""
+import json
+import logging
+import os
+
+from sqlalchemy import inspect, text
+
+from backend.app.db.database import Base, engine as default_engine
+
+# set to 0 on multi-instance deploys that run the command above instead
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "1") == "1"
+
+logger = logging.getLogger(__name__)
+
+
+def _add_column(conn, table, column, ddl_type):
+    columns = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def _create_index(conn, name, table, columns):
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    ))
+
+
+# ---------------- MIGRATIONS ----------------
+def m000_initial_schema(conn):
+    """All tables for the current models (skips the ones that exist)."""
+    import backend.app.models  # noqa: F401 - registers every model on Base
+
+    Base.metadata.create_all(conn)
+
+
+def m001_listing_indexes(conn):
+    """Keyset pagination indexes + notifications.created_at."""
+    _add_column(conn, "notifications", "created_at", "DATETIME")
+
+    _create_index(conn, "ix_question_papers_institute_status_id",
+                  "question_papers", ["institute_id", "status", "id"])
+    _create_index(conn, "ix_question_papers_institute_id_id",
+                  "question_papers", ["institute_id", "id"])
+    _create_index(conn, "ix_question_papers_institute_status_created",
+                  "question_papers", ["institute_id", "status", "created_at"])
+    _create_index(conn, "ix_notifications_faculty_id_id",
+                  "notifications", ["faculty_id", "id"])
+
+
+def m002_question_rows(conn):
+    """Move QuestionPaper.content JSON blobs into the `questions` table."""
+    from backend.app.models.question_model import Question, question_from_dict
+
+    Question.__table__.create(conn, checkfirst=True)
+
+    papers = conn.execute(text(
+        "SELECT id, content FROM question_papers WHERE content IS NOT NULL"
+    )).fetchall()
+
+    for paper_id, content in papers:
+        try:
+            questions = json.loads(content)
+        except ValueError:
+            continue  # leave unreadable blobs untouched
+
+        if not isinstance(questions, list):
+            continue
+
+        for position, q in enumerate(questions):
+            if isinstance(q, dict):
+                conn.execute(
+                    Question.__table__.insert(),
+                    {**question_from_dict(q, position), "paper_id": paper_id}
+                )
+
+        conn.execute(
+            text("UPDATE question_papers SET content = NULL WHERE id = :id"),
+            {"id": paper_id}
+        )
+
+
+def m003_institute_stats(conn):
+    """COE dashboard rollup table; rows are seeded on the first write or read."""
+    from backend.app.models.institute_stats_model import InstituteStats
+
+    InstituteStats.__table__.create(conn, checkfirst=True)
+
+
+def m004_notification_read_flag(conn):
+    """Read/unread flag on notifications."""
+    _add_column(conn, "notifications", "is_read", "BOOLEAN NOT NULL DEFAULT FALSE")
+
+
+def m005_paper_created_at(conn):
+    """Date the papers stored with a NULL created_at (dashboard age figures)."""
+    conn.execute(text(
+        "UPDATE question_papers SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"
+    ))
+
+
+MIGRATIONS = [
+    (0, "initial_schema", m000_initial_schema),
+    (1, "listing_indexes", m001_listing_indexes),
+    (2, "question_rows", m002_question_rows),
+    (3, "institute_stats", m003_institute_stats),
+    (4, "notification_read_flag", m004_notification_read_flag),
+    (5, "paper_created_at", m005_paper_created_at),
+]
+
+
+def applied_versions(conn) -> set:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+        "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def run_migrations(engine=default_engine) -> list:
+    """Apply pending migrations, each in its own transaction. Returns their names."""
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                {"v": version, "n": name}
+            )
+
+        logger.info("migration applied", extra={"version": version, "migration": name})
+        applied.append(name)
+
+    return applied
+
+
+if __name__ == "__main__":
+    from backend.app.core.logger import setup_logging, stop_logging
+
+    setup_logging()
+    try:
+        applied = run_migrations()
+        logger.info("migrations complete", extra={"applied": applied, "up_to_date": not applied})
+    finally:
+        stop_logging()
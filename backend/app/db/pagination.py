@@ -0,0 +1,59 @@
+import base64
+import json
+
+from fastapi import HTTPException, Response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str | None):
+    """Return the last seen id from an opaque cursor (None for the first page)."""
+    if not cursor:
+        return None
+
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return int(data["id"])
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
+async def keyset_page(db, stmt, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """
+    Apply keyset pagination on `id_column` to a select() of ORM rows and
+    return (rows, next_cursor).
+
+    Rows after the cursor are read straight off the index in id order;
+    one extra row is fetched to know whether another page exists.
+    """
+    last_id = decode_cursor(cursor)
+
+    if last_id is not None:
+        stmt = stmt.where(id_column < last_id if descending else id_column > last_id)
+
+    order = id_column.desc() if descending else id_column.asc()
+    rows = (await db.scalars(stmt.order_by(order).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+
+    return rows, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor):
+    """
+    The body stays a plain list (existing clients keep working); the
+    cursor for the following page travels in the X-Next-Cursor header.
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,33 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.database import AsyncSessionLocal
+
+
+# ---------------- DB DEPENDENCY ----------------
+async def get_db():
+    """
+    One AsyncSession per request, shared by every dependency of that request.
+    Anything left uncommitted is rolled back when the session closes.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ---------------- TRANSACTIONS ----------------
+@asynccontextmanager
+async def transaction(db: AsyncSession):
+    """
+    Commit the work done inside the block, or roll it back on any error:
+
+        async with transaction(db):
+            db.add(row)
+    """
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+
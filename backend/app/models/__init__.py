@@ -1,2 +1,7 @@
 from .user_model import User
-from .institute_model import Institute
\ No newline at end of file
+from .institute_model import Institute
+from .job_model import GenerationJob
+from .question_paper_model import QuestionPaper
+from .question_model import Question
+from .institute_stats_model import InstituteStats
+from .notification_model import Notification
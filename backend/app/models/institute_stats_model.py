@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Text
+from sqlalchemy.sql import func
+from backend.app.db.database import Base
+
+
+class InstituteStats(Base):
+    """
+    Per-institute rollup behind the COE dashboard.
+
+    Kept up to date in the same transaction as signup / submit_paper /
+    update_status, so a dashboard load is a single primary-key read.
+    """
+    __tablename__ = "institute_stats"
+
+    institute_id = Column(Integer, ForeignKey("institutes.id"), primary_key=True)
+
+    faculty_count = Column(Integer, nullable=False, default=0)
+
+    pending_count = Column(Integer, nullable=False, default=0)
+    approved_count = Column(Integer, nullable=False, default=0)
+    rejected_count = Column(Integer, nullable=False, default=0)
+
+    # pending-review age: sum of pending created_at (epoch seconds) → average,
+    # plus the oldest pending submission
+    pending_created_sum = Column(Float, nullable=False, default=0.0)
+    oldest_pending_at = Column(DateTime, nullable=True)
+
+    recent_submissions = Column(Text, nullable=True)  # JSON list, newest first
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
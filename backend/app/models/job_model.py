@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, LargeBinary
+from sqlalchemy.sql import func
+from backend.app.db.database import Base
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(String, primary_key=True)  # uuid4 hex
+
+    kind = Column(String, nullable=False)  # pdf / text
+
+    status = Column(String, default="queued", index=True)  # queued / running / succeeded / failed
+    progress = Column(Integer, default=0)  # 0 - 100
+    stage = Column(String, nullable=True)
+
+    params = Column(Text)  # request parameters as JSON
+    payload = Column(LargeBinary, nullable=True)  # uploaded PDF bytes
+
+    result = Column(Text, nullable=True)  # response JSON
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, default=0)
+
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index, false
+from sqlalchemy.sql import func
 from backend.app.db.database import Base
 
 class Notification(Base):
@@ -6,4 +7,15 @@ class Notification(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     faculty_id = Column(Integer, ForeignKey("users.id"))
-    message = Column(String)
\ No newline at end of file
+    message = Column(String)
+
+    is_read = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    # default= as well: the column is added by migration on old databases,
+    # where ALTER TABLE cannot carry a CURRENT_TIMESTAMP default
+    created_at = Column(DateTime, server_default=func.now(), default=func.now())
+
+    __table_args__ = (
+        # ✅ per-faculty listing in id order (keyset pagination)
+        Index("ix_notifications_faculty_id_id", "faculty_id", "id"),
+    )
@@ -0,0 +1,97 @@
+import json
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index
+from backend.app.db.database import Base
+
+
+class Question(Base):
+    __tablename__ = "questions"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    paper_id = Column(Integer, ForeignKey("question_papers.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False, default=0)  # order inside the paper
+
+    question_type = Column(String, nullable=False)  # mcq / descriptive
+    difficulty = Column(String, nullable=True)
+
+    question = Column(Text, nullable=False)
+
+    # MCQ
+    options = Column(Text, nullable=True)  # JSON list
+    correct_answer = Column(Text, nullable=True)
+
+    # DESCRIPTIVE
+    model_answer = Column(Text, nullable=True)
+    key_points = Column(Text, nullable=True)  # JSON list
+    expected_keywords = Column(Text, nullable=True)  # JSON list
+
+    image_url = Column(String, nullable=True)
+
+    __table_args__ = (
+        # ✅ assemble a paper in order with one index range scan
+        Index("ix_questions_paper_id_position", "paper_id", "position"),
+    )
+
+
+# ---------------- ROW <-> DICT ----------------
+_LIST_FIELDS = ("options", "key_points", "expected_keywords")
+_TEXT_FIELDS = ("question", "correct_answer", "model_answer", "image_url", "difficulty")
+
+EDITABLE_FIELDS = _LIST_FIELDS + _TEXT_FIELDS
+
+
+def _load_list(value):
+    if not value:
+        return []
+    try:
+        data = json.loads(value)
+    except ValueError:
+        return []
+    return data if isinstance(data, list) else []
+
+
+def question_fields(data: dict) -> dict:
+    """Column values for the editable fields present in a question dict."""
+    fields = {}
+
+    for name in _LIST_FIELDS:
+        if name in data:
+            fields[name] = json.dumps(data[name] or [])
+
+    for name in _TEXT_FIELDS:
+        if name in data:
+            fields[name] = data[name]
+
+    return fields
+
+
+def question_from_dict(data: dict, position: int, difficulty=None) -> dict:
+    """Insert values for one generated question (same shape as the API returns)."""
+    row = question_fields(data)
+    row["question"] = str(data.get("question", ""))
+    row["question_type"] = data.get("question_type") or ("mcq" if "options" in data else "descriptive")
+    row["difficulty"] = data.get("difficulty") or difficulty
+    row["position"] = position
+    return row
+
+
+def question_to_dict(question: Question) -> dict:
+    """Same shape as the generated MCQ / DescriptiveQuestion schemas."""
+    data = {
+        "id": question.id,
+        "question": question.question,
+        "question_type": question.question_type,
+        "difficulty": question.difficulty,
+        "image_url": question.image_url,
+    }
+
+    if question.question_type == "mcq":
+        data["options"] = _load_list(question.options)
+        data["correct_answer"] = question.correct_answer
+    else:
+        data["model_answer"] = question.model_answer
+        data["key_points"] = _load_list(question.key_points)
+        data["expected_keywords"] = _load_list(question.expected_keywords)
+
+    return data
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.app.db.database import Base
 
@@ -10,11 +11,28 @@ class QuestionPaper(Base):
 
     title = Column(String, nullable=True)
 
-    content = Column(Text)  # store generated questions JSON/string
+    # legacy JSON blob; questions now live in the `questions` table
+    # (migration 2 moves old blobs into rows and clears this column)
+    content = Column(Text, nullable=True)
 
     faculty_id = Column(Integer, ForeignKey("users.id"))
     institute_id = Column(Integer, ForeignKey("institutes.id"))
 
     status = Column(String, default="pending")  # pending / approved / rejected
 
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now())
+
+    questions = relationship(
+        "Question",
+        order_by="Question.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        # ✅ COE listing: institute (+ status) filter, newest first by id
+        Index("ix_question_papers_institute_status_id", "institute_id", "status", "id"),
+        Index("ix_question_papers_institute_id_id", "institute_id", "id"),
+        # ✅ date-range filters within an institute / status
+        Index("ix_question_papers_institute_status_created", "institute_id", "status", "created_at"),
+    )
\ No newline at end of file
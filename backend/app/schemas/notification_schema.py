@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+# ---------------- MARK AS READ ----------------
+class MarkReadRequest(BaseModel):
+    # ✅ one of the two; neither marks everything
+    ids: Optional[List[int]] = None
+    up_to_id: Optional[int] = None
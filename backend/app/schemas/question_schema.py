@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from typing import Optional, List, Literal, Union
 
 
@@ -32,7 +32,40 @@ class QuestionRequest(BaseModel):
     question_type: Literal["descriptive", "mcq"] = "descriptive"
     include_images: Optional[bool] = False
 
+    # ✅ skip the LLM response cache and ask the model again
+    force_fresh: Optional[bool] = False
+
+    # ✅ per-request model override (defaults to LLM_MODEL)
+    model: Optional[str] = None
+
+    # ✅ questions from earlier requests that must not come back
+    exclude_questions: Optional[List[str]] = None
+
+    # ✅ return a job id right away and generate in the background
+    async_job: Optional[bool] = False
+
 
 # ---------------- RESPONSE ----------------
 class QuestionResponse(BaseModel):
-    questions: List[Union[MCQ, DescriptiveQuestion]]
\ No newline at end of file
+    questions: List[Union[MCQ, DescriptiveQuestion]]
+    duplicates_removed: int = 0
+
+
+# ---------------- EDIT ONE QUESTION ----------------
+class QuestionUpdate(BaseModel):
+    """PATCH body: only the fields actually sent are changed (exclude_unset)."""
+    question: Optional[str] = None
+    options: Optional[List[str]] = None
+    correct_answer: Optional[str] = None
+    model_answer: Optional[str] = None
+    key_points: Optional[List[str]] = None
+    expected_keywords: Optional[List[str]] = None
+    image_url: Optional[str] = None
+    difficulty: Optional[str] = None
+
+    # ✅ may be left out, but not cleared: the column is NOT NULL
+    @validator("question")
+    def question_not_null(cls, value):
+        if value is None:
+            raise ValueError("question cannot be null")
+        return value
@@ -0,0 +1,309 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.session import transaction
+from backend.app.models.institute_model import Institute
+from backend.app.models.institute_stats_model import InstituteStats
+from backend.app.models.question_model import Question
+from backend.app.models.question_paper_model import QuestionPaper
+from backend.app.models.user_model import User
+from backend.app.utils.ttl_cache import TTLCache
+
+# explicit invalidation keeps this process exact; the TTL bounds how stale
+# another worker process can be
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "1000"))
+RECENT_SUBMISSIONS_LIMIT = int(os.getenv("RECENT_SUBMISSIONS_LIMIT", "10"))
+
+STATUS_COUNTERS = {
+    "pending": "pending_count",
+    "approved": "approved_count",
+    "rejected": "rejected_count",
+}
+
+dashboard_cache = TTLCache(DASHBOARD_CACHE_TTL_SECONDS, DASHBOARD_CACHE_MAX_ENTRIES, name="dashboard")
+
+
+def utcnow() -> datetime:
+    """Naive UTC, the same form SQLite's CURRENT_TIMESTAMP stores."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def submission_summary(paper: QuestionPaper, question_count: int) -> dict:
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "faculty_id": paper.faculty_id,
+        "status": paper.status,
+        "created_at": paper.created_at.isoformat() if paper.created_at else None,
+        "question_count": question_count,
+    }
+
+
+def invalidate_dashboard(*institute_ids):
+    """Call after the writing transaction has committed."""
+    for institute_id in institute_ids:
+        dashboard_cache.delete(institute_id)
+
+
+# -------------------------------------------------
+# WRITE SIDE (call inside the writer's transaction)
+# -------------------------------------------------
+async def _bump(db: AsyncSession, institute_id, **deltas) -> bool:
+    """
+    Atomic `counter = counter + delta` on the rollup row. When the row does
+    not exist yet it is seeded here, from base tables that already include
+    this transaction's write, and False is returned: nothing left to apply.
+    """
+    stmt = (
+        update(InstituteStats)
+        .where(InstituteStats.institute_id == institute_id)
+        .values(**{
+            name: getattr(InstituteStats, name) + delta
+            for name, delta in deltas.items()
+        })
+    )
+
+    if (await db.execute(stmt)).rowcount:
+        return True
+
+    if await _seed_stats(db, institute_id):
+        return False
+
+    # another transaction seeded it first, without this write
+    await db.execute(stmt)
+    return True
+
+
+async def _locked_stats(db: AsyncSession, institute_id) -> InstituteStats:
+    # the counter UPDATE above already holds the write lock on SQLite;
+    # FOR UPDATE covers server databases
+    return await db.get(
+        InstituteStats, institute_id, with_for_update=True, populate_existing=True
+    )
+
+
+async def record_faculty_signup(db: AsyncSession, institute_id):
+    await _bump(db, institute_id, faculty_count=1)
+
+
+async def record_submission(db: AsyncSession, paper: QuestionPaper, question_count: int):
+    """`paper` must be flushed (id and created_at set)."""
+    if not await _bump(db, paper.institute_id, pending_count=1,
+                       pending_created_sum=_epoch(paper.created_at)):
+        return
+
+    stats = await _locked_stats(db, paper.institute_id)
+
+    if stats.oldest_pending_at is None or paper.created_at < stats.oldest_pending_at:
+        stats.oldest_pending_at = paper.created_at
+
+    recent = json.loads(stats.recent_submissions or "[]")
+    recent.insert(0, submission_summary(paper, question_count))
+    stats.recent_submissions = json.dumps(recent[:RECENT_SUBMISSIONS_LIMIT])
+
+
+async def record_status_changes(db: AsyncSession, changes: list):
+    """
+    `changes` is a list of (paper, old_status) whose new status is already
+    set on the paper. Counters move in one UPDATE per institute.
+    """
+    await db.flush()  # the oldest-pending lookup below must see the new statuses
+
+    by_institute = {}
+    for paper, old_status in changes:
+        if old_status == paper.status:
+            continue
+        by_institute.setdefault(paper.institute_id, []).append((paper, old_status))
+
+    for institute_id, items in by_institute.items():
+        deltas = {}
+        for paper, old_status in items:
+            for status, step in ((old_status, -1), (paper.status, 1)):
+                name = STATUS_COUNTERS.get(status)
+                if name:
+                    deltas[name] = deltas.get(name, 0) + step
+            if old_status == "pending":
+                deltas["pending_created_sum"] = (
+                    deltas.get("pending_created_sum", 0.0) - _epoch(paper.created_at)
+                )
+
+        if not await _bump(db, institute_id, **deltas):
+            continue
+
+        stats = await _locked_stats(db, institute_id)
+
+        if stats.pending_count <= 0:
+            stats.pending_created_sum = 0.0  # drop float drift
+            stats.oldest_pending_at = None
+        elif stats.oldest_pending_at is None or any(
+            old_status == "pending" and (
+                paper.created_at is None or paper.created_at <= stats.oldest_pending_at
+            )
+            for paper, old_status in items
+        ):
+            # one seek on (institute_id, status, created_at); MIN skips NULLs,
+            # so only undated papers left means "now", as in _stats_values
+            stats.oldest_pending_at = await db.scalar(
+                select(func.min(QuestionPaper.created_at)).where(
+                    QuestionPaper.institute_id == institute_id,
+                    QuestionPaper.status == "pending"
+                )
+            ) or utcnow()
+
+        new_status = {paper.id: paper.status for paper, _ in items}
+        recent = json.loads(stats.recent_submissions or "[]")
+        for item in recent:
+            item["status"] = new_status.get(item["id"], item["status"])
+        stats.recent_submissions = json.dumps(recent)
+
+
+# -------------------------------------------------
+# SEEDING (first write or first read for an institute)
+# -------------------------------------------------
+async def _stats_values(db: AsyncSession, institute_id) -> dict:
+    faculty_count = await db.scalar(
+        select(func.count(User.id)).where(
+            User.role == "faculty",
+            User.institute_id == institute_id
+        )
+    )
+
+    counts = dict((await db.execute(
+        select(QuestionPaper.status, func.count(QuestionPaper.id))
+        .where(QuestionPaper.institute_id == institute_id)
+        .group_by(QuestionPaper.status)
+    )).all())
+
+    pending_created = (await db.scalars(
+        select(QuestionPaper.created_at).where(
+            QuestionPaper.institute_id == institute_id,
+            QuestionPaper.status == "pending"
+        )
+    )).all()
+    # same rows in the count and the age figures: an undated paper (only
+    # possible before migration 5 backfilled them) counts as submitted now
+    now = utcnow()
+    pending_created = [value or now for value in pending_created]
+
+    recent_papers = (await db.scalars(
+        select(QuestionPaper)
+        .where(QuestionPaper.institute_id == institute_id)
+        .order_by(QuestionPaper.id.desc())
+        .limit(RECENT_SUBMISSIONS_LIMIT)
+    )).all()
+
+    question_counts = {}
+    if recent_papers:
+        question_counts = dict((await db.execute(
+            select(Question.paper_id, func.count(Question.id))
+            .where(Question.paper_id.in_([paper.id for paper in recent_papers]))
+            .group_by(Question.paper_id)
+        )).all())
+
+    return {
+        "faculty_count": faculty_count or 0,
+        "pending_count": len(pending_created),
+        "approved_count": counts.get("approved", 0),
+        "rejected_count": counts.get("rejected", 0),
+        "pending_created_sum": sum(_epoch(value) for value in pending_created),
+        "oldest_pending_at": min(pending_created, default=None),
+        "recent_submissions": json.dumps([
+            submission_summary(paper, question_counts.get(paper.id, 0))
+            for paper in recent_papers
+        ]),
+    }
+
+
+async def _seed_stats(db: AsyncSession, institute_id) -> bool:
+    """
+    INSERT ... ON CONFLICT DO NOTHING of the row computed from the base
+    tables. True when this call created it; False when a concurrent
+    transaction already had (its row is authoritative, ours is discarded).
+    """
+    await db.flush()  # the counts must include this transaction's pending writes
+
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    result = await db.execute(
+        insert(InstituteStats)
+        .values(institute_id=institute_id, **await _stats_values(db, institute_id))
+        .on_conflict_do_nothing(index_elements=[InstituteStats.institute_id])
+    )
+    return bool(result.rowcount)
+
+
+async def _build_stats(db: AsyncSession, institute_id) -> InstituteStats:
+    async with transaction(db):
+        await _seed_stats(db, institute_id)
+
+    # ours or the one a concurrent writer / reader inserted first
+    return await db.get(InstituteStats, institute_id, populate_existing=True)
+
+
+# -------------------------------------------------
+# READ SIDE
+# -------------------------------------------------
+def _snapshot(stats: InstituteStats, institute_name) -> dict:
+    return {
+        "institute_name": institute_name,
+        "faculty_count": stats.faculty_count,
+        "papers_by_status": {
+            status: getattr(stats, name) for status, name in STATUS_COUNTERS.items()
+        },
+        "pending_created_sum": stats.pending_created_sum,
+        "oldest_pending_at": stats.oldest_pending_at,
+        "recent_submissions": json.loads(stats.recent_submissions or "[]"),
+    }
+
+
+async def get_dashboard(db: AsyncSession, institute_id) -> dict | None:
+    """Read-through: cache → one primary-key read → (first time only) backfill."""
+    found, snapshot = dashboard_cache.get(institute_id)
+
+    if not found:
+        row = (await db.execute(
+            select(InstituteStats, Institute.name)
+            .join(Institute, Institute.id == InstituteStats.institute_id)
+            .where(InstituteStats.institute_id == institute_id)
+        )).first()
+
+        if row is not None:
+            stats, institute_name = row
+        else:
+            institute = await db.get(Institute, institute_id)
+            if institute is None:
+                return None
+            institute_name = institute.name
+            stats = await _build_stats(db, institute_id)
+
+        snapshot = _snapshot(stats, institute_name)
+        dashboard_cache.set(institute_id, snapshot)
+
+    # ages are computed per request so a cached snapshot never goes stale
+    now = _epoch(utcnow())
+    pending = snapshot["papers_by_status"]["pending"]
+    oldest = snapshot["oldest_pending_at"]
+
+    return {
+        "institute_name": snapshot["institute_name"],
+        "faculty_count": snapshot["faculty_count"],
+        "papers_by_status": snapshot["papers_by_status"],
+        "total_papers": sum(snapshot["papers_by_status"].values()),
+        "pending_review": {
+            "count": pending,
+            "oldest_age_seconds": round(now - _epoch(oldest)) if oldest else None,
+            "average_age_seconds": (
+                round(now - snapshot["pending_created_sum"] / pending) if pending else None
+            ),
+        },
+        "recent_submissions": snapshot["recent_submissions"],
+    }
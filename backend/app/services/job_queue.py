@@ -0,0 +1,273 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+from fastapi import HTTPException
+
+from backend.app.db.database import SessionLocal
+from backend.app.core.logger import request_id_var
+from backend.app.models.job_model import GenerationJob
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "2"))
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+logger = logging.getLogger(__name__)
+
+# kind → async handler(params: dict, payload: bytes | None, progress) -> dict
+_handlers = {}
+
+
+def register_job_handler(kind: str, handler):
+    _handlers[kind] = handler
+
+
+def job_to_dict(job: GenerationJob, include_result=True) -> dict:
+    data = {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "stage": job.stage,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+    if include_result and job.result:
+        data["result"] = json.loads(job.result)
+
+    return data
+
+
+# -------------------------------------------------
+# DB HELPERS (sync, run via asyncio.to_thread)
+# -------------------------------------------------
+def _insert_job(job_id, kind, params, payload):
+    db = SessionLocal()
+    try:
+        db.add(GenerationJob(
+            id=job_id,
+            kind=kind,
+            status="queued",
+            params=json.dumps(params),
+            payload=payload
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _update_job(job_id, **fields):
+    db = SessionLocal()
+    try:
+        db.query(GenerationJob).filter(GenerationJob.id == job_id).update(fields)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _claim_job(job_id):
+    """Atomically move a queued job to running; returns the job or None."""
+    db = SessionLocal()
+    try:
+        claimed = db.query(GenerationJob).filter(
+            GenerationJob.id == job_id,
+            GenerationJob.status == "queued"
+        ).update({
+            "status": "running",
+            "stage": "starting",
+            "attempts": GenerationJob.attempts + 1
+        })
+        db.commit()
+
+        if not claimed:
+            return None
+
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        db.expunge(job)
+        return job
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _unfinished_job_ids():
+    """
+    Jobs that were queued or running when the process stopped.
+
+    Assumes one API process owns the queue (our Render deployment);
+    running jobs are reset to queued and picked up again, unless they
+    already used up JOB_MAX_ATTEMPTS (a job that crashes or OOMs the
+    process would otherwise be retried on every restart).
+    """
+    db = SessionLocal()
+    try:
+        running = db.query(GenerationJob).filter(GenerationJob.status == "running")
+
+        exhausted = running.filter(GenerationJob.attempts >= JOB_MAX_ATTEMPTS).update({
+            "status": "failed",
+            "stage": "failed",
+            "error": "Process stopped while the job was running (attempts exhausted)",
+            "payload": None
+        }, synchronize_session=False)
+
+        running.update(
+            {"status": "queued", "stage": "requeued after restart"},
+            synchronize_session=False
+        )
+        db.commit()
+
+        if exhausted:
+            logger.warning("jobs failed after restart", extra={"count": exhausted})
+
+        rows = db.query(GenerationJob.id).filter(
+            GenerationJob.status == "queued"
+        ).order_by(GenerationJob.created_at).all()
+        return [row.id for row in rows]
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_job(job_id):
+    db = SessionLocal()
+    try:
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        if job is not None:
+            db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+
+# -------------------------------------------------
+# QUEUE
+# -------------------------------------------------
+class JobQueue:
+    """
+    In-process worker pool backed by the generation_jobs table.
+
+    Every state change is written to the database first, so a restart
+    only loses the in-memory queue, which `start` rebuilds from the
+    unfinished rows.
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.workers = max(1, workers)
+        self._queue = None
+        self._tasks = []
+
+    async def start(self):
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue()
+
+        for job_id in await asyncio.to_thread(_unfinished_job_ids):
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, params: dict, payload: bytes | None = None) -> str:
+        if kind not in _handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(_insert_job, job_id, kind, params, payload)
+
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+        return job_id
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            # ✅ job logs are tagged with the job id
+            token = request_id_var.set(f"job-{job_id}")
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("job worker error", extra={"job_id": job_id})
+            finally:
+                request_id_var.reset(token)
+                self._queue.task_done()
+
+    async def _run(self, job_id):
+        job = await asyncio.to_thread(_claim_job, job_id)
+        if job is None:
+            return
+
+        async def progress(percent: int, stage: str):
+            await asyncio.to_thread(
+                _update_job, job_id, progress=int(percent), stage=stage
+            )
+
+        try:
+            handler = _handlers[job.kind]
+            result = await handler(json.loads(job.params or "{}"), job.payload, progress)
+
+        except asyncio.CancelledError:
+            # shutting down: leave it for the next start, without using up an attempt
+            await asyncio.to_thread(
+                _update_job, job_id, status="queued", stage="interrupted",
+                attempts=GenerationJob.attempts - 1
+            )
+            raise
+
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            retry = not isinstance(e, HTTPException) and job.attempts < JOB_MAX_ATTEMPTS
+
+            fields = {
+                "status": "queued" if retry else "failed",
+                "stage": "retrying" if retry else "failed",
+                "error": str(detail),
+            }
+            if not retry:
+                fields["payload"] = None  # uploaded file no longer needed
+
+            await asyncio.to_thread(_update_job, job_id, **fields)
+
+            if retry:
+                self._queue.put_nowait(job_id)
+            return
+
+        await asyncio.to_thread(
+            _update_job,
+            job_id,
+            status="succeeded",
+            progress=100,
+            stage="done",
+            result=json.dumps(result),
+            payload=None  # uploaded file no longer needed
+        )
+
+
+job_queue = JobQueue()
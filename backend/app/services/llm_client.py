@@ -1,17 +1,111 @@
+import asyncio
 import os
+import time
 from dotenv import load_dotenv
-from groq import Groq
+
+from backend.app.services.llm_cache import (
+    LLM_CACHE_ENABLED,
+    get_llm_cache,
+    make_cache_key,
+)
+from backend.app.services.llm_providers import get_llm_provider
+from backend.app.core.metrics import CACHE_REQUESTS, LLM_REQUEST_SECONDS
+
 load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
-def generate_questions(prompt: str) -> str:
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[
-            {"role": "system", "content": "You are an expert educational content creator."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7
-    )
-
-    return response.choices[0].message.content
+
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
+DEFAULT_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+
+
+async def _cache_lookup(prompt, model, temperature, use_cache):
+    """Return (cache, key, cached_text); cache is None when disabled."""
+    if not LLM_CACHE_ENABLED:
+        return None, None, None
+
+    cache = get_llm_cache()
+    key = make_cache_key(prompt, model, temperature)
+
+    if not use_cache:
+        CACHE_REQUESTS.inc("llm", "bypass")
+        return cache, key, None
+
+    # sqlite read → keep it off the event loop
+    cached = await asyncio.to_thread(cache.get, key)
+    CACHE_REQUESTS.inc("llm", "miss" if cached is None else "hit")
+    return cache, key, cached
+
+
+async def generate_questions(
+    prompt: str,
+    use_cache: bool = True,
+    model: str | None = None,
+    temperature: float | None = None
+) -> str:
+    """
+    Return the raw LLM completion for `prompt`.
+
+    Identical prompts (same model + temperature) are served from the on-disk
+    cache. Pass use_cache=False to force a fresh completion; the fresh
+    result still refreshes the cache entry.
+    """
+    model = model or DEFAULT_MODEL
+    temperature = DEFAULT_TEMPERATURE if temperature is None else temperature
+
+    cache, key, cached = await _cache_lookup(prompt, model, temperature, use_cache)
+    if cached is not None:
+        return cached
+
+    provider = get_llm_provider()
+    start = time.perf_counter()
+    outcome = "error"
+
+    try:
+        content = await provider.complete(prompt, model, temperature)
+        outcome = "ok"
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, provider.name, model, outcome)
+
+    if cache is not None and content:
+        await asyncio.to_thread(cache.set, key, model, content)
+
+    return content
+
+
+async def stream_questions(
+    prompt: str,
+    use_cache: bool = True,
+    model: str | None = None,
+    temperature: float | None = None
+):
+    """
+    Yield the LLM completion for `prompt` piece by piece.
+
+    A cache hit is yielded as a single piece. A fresh completion is
+    streamed from the provider and written to the cache once complete.
+    """
+    model = model or DEFAULT_MODEL
+    temperature = DEFAULT_TEMPERATURE if temperature is None else temperature
+
+    cache, key, cached = await _cache_lookup(prompt, model, temperature, use_cache)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    provider = get_llm_provider()
+    start = time.perf_counter()
+    outcome = "error"
+
+    try:
+        async for delta in provider.stream(prompt, model, temperature):
+            parts.append(delta)
+            yield delta
+        outcome = "ok"
+    except GeneratorExit:
+        outcome = "cancelled"  # caller stopped reading (enough questions)
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, provider.name, model, outcome)
+
+    if cache is not None and parts:
+        await asyncio.to_thread(cache.set, key, model, "".join(parts))
@@ -0,0 +1,330 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from abc import ABC, abstractmethod
+
+import httpx
+
+from backend.app.core.metrics import LLM_TOKENS
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # groq / fake
+
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+SYSTEM_PROMPT = "You are an expert educational content creator."
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMProviderError(Exception):
+    """Raised when a provider gives up on a completion."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def build_messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+# -------------------------------------------------
+# PROVIDER INTERFACE
+# -------------------------------------------------
+class LLMProvider(ABC):
+    """
+    Minimal async interface every LLM backend implements; a subclass
+    without `complete` fails when it is instantiated.
+
+    `complete` returns the whole completion text, `stream` yields it piece
+    by piece. Both take the model and temperature per call.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def complete(self, prompt: str, model: str, temperature: float) -> str:
+        ...
+
+    async def stream(self, prompt: str, model: str, temperature: float):
+        # default: no real streaming, emit the full completion once
+        yield await self.complete(prompt, model, temperature)
+
+    async def aclose(self):
+        pass
+
+
+# -------------------------------------------------
+# GROQ (OpenAI-compatible HTTP API)
+# -------------------------------------------------
+class GroqProvider(LLMProvider):
+    """
+    Async Groq client on a shared httpx connection pool.
+
+    429 and 5xx responses (and connection errors) are retried with
+    exponential backoff plus full jitter; `Retry-After` is honoured when
+    the server sends it.
+    """
+
+    name = "groq"
+
+    def __init__(
+        self,
+        api_key=None,
+        base_url=GROQ_BASE_URL,
+        timeout=LLM_TIMEOUT_SECONDS,
+        max_retries=LLM_MAX_RETRIES,
+        max_connections=LLM_MAX_CONNECTIONS,
+        backoff_base=0.5,
+        backoff_max=8.0
+    ):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    def _payload(self, prompt, model, temperature, stream=False):
+        payload = {
+            "model": model,
+            "messages": build_messages(prompt),
+            "temperature": temperature,
+            "stream": stream
+        }
+        if stream:
+            # ✅ token usage in the final chunk
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _record_usage(self, model, usage):
+        if not usage:
+            return
+        LLM_TOKENS.inc(self.name, model, "prompt", amount=usage.get("prompt_tokens") or 0)
+        LLM_TOKENS.inc(self.name, model, "completion", amount=usage.get("completion_tokens") or 0)
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    async def _send(self, payload: dict, stream: bool):
+        """POST with retries; returns an open response (caller closes it)."""
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+
+            try:
+                request = self._client.build_request(
+                    "POST", "/chat/completions", json=payload
+                )
+                response = await self._client.send(request, stream=stream)
+
+                if response.status_code < 400:
+                    return response
+
+                await response.aread()
+                last_error = LLMProviderError(
+                    f"LLM request failed ({response.status_code}): "
+                    f"{response.text[:200]}",
+                    status_code=response.status_code
+                )
+                await response.aclose()
+
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise last_error
+
+            except httpx.TransportError as e:
+                last_error = LLMProviderError(f"LLM connection error: {e}")
+                response = None
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, response))
+
+        raise last_error
+
+    async def complete(self, prompt, model, temperature):
+        response = await self._send(
+            self._payload(prompt, model, temperature), stream=False
+        )
+        data = response.json()
+        self._record_usage(model, data.get("usage"))
+        return data["choices"][0]["message"]["content"]
+
+    async def stream(self, prompt, model, temperature):
+        response = await self._send(
+            self._payload(prompt, model, temperature, stream=True), stream=True
+        )
+
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                event = json.loads(data)
+                self._record_usage(
+                    model, event.get("usage") or (event.get("x_groq") or {}).get("usage")
+                )
+                choices = event.get("choices") or []
+                if not choices:
+                    continue
+
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+        finally:
+            await response.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# -------------------------------------------------
+# FAKE (local stand-in for load tests / benchmarks)
+# -------------------------------------------------
+class FakeProvider(LLMProvider):
+    """
+    Deterministic in-process stand-in for the LLM.
+
+    Answers with a well-formed JSON array shaped like the prompt asks
+    for (question count and MCQ vs descriptive), derived from a hash of
+    the prompt so the same prompt always gives the same output.
+    `latency` seconds are spent per call and `failure_rate` of calls
+    raise LLMProviderError, driven by a seeded RNG.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency=float(os.getenv("FAKE_LLM_LATENCY", "0")),
+        failure_rate=float(os.getenv("FAKE_LLM_FAILURE_RATE", "0")),
+        seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+        stream_pieces=8
+    ):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.stream_pieces = max(1, stream_pieces)
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def render(self, prompt: str) -> str:
+        match = re.search(r"EXACTLY (\d+)", prompt)
+        count = int(match.group(1)) if match else 5
+        is_mcq = "MCQs" in prompt
+        questions = []
+        for i in range(1, count + 1):
+            # distinct pseudo-words per question so answers don't look
+            # like near-duplicates of each other
+            digest = hashlib.sha1(f"{prompt}|{i}".encode("utf-8")).hexdigest()
+            words = [digest[j:j + 8] for j in range(0, 40, 8)]
+            topic = " ".join(words[:3])
+
+            if is_mcq:
+                questions.append({
+                    "question": f"Which statement about {topic} is correct?",
+                    "options": [f"{w} {c}" for c, w in zip("ABCD", words[1:])],
+                    "correct_answer": f"{words[1]} A"
+                })
+            else:
+                questions.append({
+                    "question": f"Explain {topic} in detail.",
+                    "model_answer": f"{topic} relates to {words[3]} and {words[4]}.",
+                    "key_points": words[1:5],
+                    "expected_keywords": words
+                })
+
+        return json.dumps(questions)
+
+    async def _simulate(self):
+        self.calls += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise LLMProviderError("Injected fake LLM failure", status_code=503)
+
+    async def complete(self, prompt, model, temperature):
+        await self._simulate()
+        return self.render(prompt)
+
+    async def stream(self, prompt, model, temperature):
+        await self._simulate()
+
+        text = self.render(prompt)
+        size = max(1, len(text) // self.stream_pieces)
+
+        for i in range(0, len(text), size):
+            yield text[i:i + size]
+            await asyncio.sleep(0)
+
+
+# -------------------------------------------------
+# REGISTRY
+# -------------------------------------------------
+PROVIDERS = {
+    "groq": GroqProvider,
+    "fake": FakeProvider,
+}
+
+_provider = None
+
+
+def get_llm_provider() -> LLMProvider:
+    """Process-wide provider selected by LLM_PROVIDER, created on first use."""
+    global _provider
+
+    if _provider is None:
+        if LLM_PROVIDER not in PROVIDERS:
+            raise ValueError(f"Unknown LLM_PROVIDER: {LLM_PROVIDER}")
+        _provider = PROVIDERS[LLM_PROVIDER]()
+
+    return _provider
+
+
+def set_llm_provider(provider: LLMProvider):
+    """Swap the active provider (used by benchmarks and load tests)."""
+    global _provider
+    _provider = provider
+
+
+async def close_llm_provider():
+    global _provider
+
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
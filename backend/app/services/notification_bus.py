@@ -0,0 +1,67 @@
+import asyncio
+import os
+
+# per-subscriber buffer; when a slow client lets it fill up, the queued events
+# are replaced by one resync marker and the stream re-reads them from the database
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", "100"))
+
+# marker event key: "replay everything with id > this value"
+RESYNC_KEY = "resync_after"
+
+
+def notification_to_dict(notification) -> dict:
+    return {
+        "id": notification.id,
+        "faculty_id": notification.faculty_id,
+        "message": notification.message,
+        "is_read": bool(notification.is_read),
+        "created_at": notification.created_at,
+    }
+
+
+class NotificationBus:
+    """
+    In-process pub/sub: faculty_id → the queues of that faculty's open
+    streams. Publish only after the notification rows are committed.
+
+    Runs on the event loop; with several worker processes each one only
+    sees its own publishes, and clients fill gaps via `since_id`.
+    """
+
+    def __init__(self, queue_size=NOTIFICATION_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers = {}
+
+    def subscribe(self, faculty_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(faculty_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, faculty_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(faculty_id)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[faculty_id]
+
+    def publish(self, faculty_id: int, event: dict):
+        for queue in self._subscribers.get(faculty_id, ()):
+            if not queue.full():
+                queue.put_nowait(event)
+                continue
+
+            # dropping events silently would move the client's Last-Event-ID
+            # past them; the rows are committed, so the stream replays them
+            pending = [queue.get_nowait() for _ in range(queue.qsize())] + [event]
+            queue.put_nowait({RESYNC_KEY: min(
+                item[RESYNC_KEY] if RESYNC_KEY in item else item["id"] - 1
+                for item in pending
+            )})
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+notification_bus = NotificationBus()
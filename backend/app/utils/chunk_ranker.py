@@ -0,0 +1,185 @@
+import math
+import os
+import re
+from collections import Counter
+
+# How many questions we ask the model for per selected chunk
+QUESTIONS_PER_CHUNK = int(os.getenv("QUESTIONS_PER_CHUNK", "3"))
+
+# Chunks below this share of real words (vs numbers, dot leaders, symbols)
+# are treated as front matter / tables of contents
+MIN_INFORMATION_SCORE = float(os.getenv("MIN_INFORMATION_SCORE", "0.35"))
+MIN_CHUNK_TERMS = int(os.getenv("MIN_CHUNK_TERMS", "25"))
+
+# Cosine similarity above which two chunks count as near-duplicates
+DUPLICATE_SIMILARITY = float(os.getenv("CHUNK_DUPLICATE_SIMILARITY", "0.85"))
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+MMR_LAMBDA = 0.7
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because
+been before being below between both but by can could did do does doing down
+during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off on
+once only or other our ours out over own same she should so some such than that
+the their theirs them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with
+would you your yours
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [
+        w for w in _WORD_RE.findall(text.lower())
+        if len(w) > 2 and w not in STOPWORDS
+    ]
+
+
+def information_score(text: str, terms: list) -> float:
+    """
+    Share of whitespace-separated words that are real content terms,
+    scaled by vocabulary variety. Tables of contents, indexes and
+    copyright pages score low.
+    """
+    words = text.split()
+    if not words or not terms:
+        return 0.0
+
+    content_ratio = min(1.0, len(terms) / len(words))
+    variety = len(set(terms)) / len(terms)
+    return content_ratio * min(1.0, variety * 2)
+
+
+# -----------------------------------------
+# SCORING
+# -----------------------------------------
+def _idf(doc_freq: Counter, n_docs: int) -> dict:
+    return {
+        term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for term, df in doc_freq.items()
+    }
+
+
+def _bm25(tf: Counter, length: int, avg_length: float, query: dict, idf: dict) -> float:
+    score = 0.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+
+    for term, weight in query.items():
+        freq = tf.get(term)
+        if not freq:
+            continue
+        score += weight * idf.get(term, 0.0) * freq * (BM25_K1 + 1) / (freq + norm)
+
+    return score
+
+
+def _tfidf_vector(tf: Counter, idf: dict) -> dict:
+    vec = {term: freq * idf[term] for term, freq in tf.items()}
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {term: v / norm for term, v in vec.items()}
+
+
+def _cosine(a: dict, b: dict) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(term, 0.0) for term, v in a.items())
+
+
+def build_query(topic=None, keywords=None, doc_tf=None, idf=None, size=20) -> dict:
+    """
+    Weighted query terms. Topic and keywords are used when given
+    (keywords count double); otherwise the document's most characteristic
+    terms stand in, so chunks central to the document rank first.
+    """
+    query = Counter()
+
+    for term in tokenize(topic or ""):
+        query[term] += 1.0
+    for keyword in keywords or []:
+        for term in tokenize(keyword):
+            query[term] += 2.0
+
+    if not query and doc_tf:
+        weighted = {term: freq * idf.get(term, 0.0) for term, freq in doc_tf.items()}
+        for term, _ in sorted(weighted.items(), key=lambda x: (-x[1], x[0]))[:size]:
+            query[term] = 1.0
+
+    return dict(query)
+
+
+# -----------------------------------------
+# SELECTION
+# -----------------------------------------
+def chunks_needed(num_questions: int, available: int) -> int:
+    return max(1, min(available, math.ceil(num_questions / QUESTIONS_PER_CHUNK)))
+
+
+def select_chunks(chunks: list, k: int, topic=None, keywords=None) -> list:
+    """
+    Rank chunks locally and return the `k` best diverse ones, best first.
+
+    1. drop low-information chunks (front matter, TOCs, indexes)
+    2. score the rest with BM25 against the topic / keywords (or the
+       document's own top terms)
+    3. pick greedily with MMR, skipping near-duplicates of anything
+       already picked
+
+    Each returned chunk is a copy with a "score" field added.
+    """
+    if not chunks:
+        return []
+
+    terms = [tokenize(chunk["text"]) for chunk in chunks]
+
+    candidates = [
+        i for i, chunk in enumerate(chunks)
+        if len(terms[i]) >= MIN_CHUNK_TERMS
+        and information_score(chunk["text"], terms[i]) >= MIN_INFORMATION_SCORE
+    ]
+    if not candidates:  # tiny document: keep everything
+        candidates = list(range(len(chunks)))
+
+    tfs = {i: Counter(terms[i]) for i in candidates}
+    doc_freq = Counter()
+    doc_tf = Counter()
+    for tf in tfs.values():
+        doc_freq.update(tf.keys())
+        doc_tf.update(tf)
+
+    idf = _idf(doc_freq, len(candidates))
+    avg_length = sum(len(terms[i]) for i in candidates) / len(candidates) or 1.0
+    query = build_query(topic, keywords, doc_tf, idf)
+
+    relevance = {
+        i: _bm25(tfs[i], len(terms[i]), avg_length, query, idf)
+        for i in candidates
+    }
+    top = max(relevance.values()) or 1.0
+    vectors = {i: _tfidf_vector(tfs[i], idf) for i in candidates}
+
+    selected = []
+    remaining = sorted(candidates, key=lambda i: (-relevance[i], i))
+
+    while remaining and len(selected) < k:
+        best, best_score = None, None
+
+        for i in remaining:
+            redundancy = max((_cosine(vectors[i], vectors[j]) for j in selected), default=0.0)
+            if redundancy >= DUPLICATE_SIMILARITY:
+                continue
+
+            score = MMR_LAMBDA * relevance[i] / top - (1 - MMR_LAMBDA) * redundancy
+            if best_score is None or score > best_score:
+                best, best_score = i, score
+
+        if best is None:  # everything left duplicates a selected chunk
+            break
+
+        selected.append(best)
+        remaining.remove(best)
+
+    return [dict(chunks[i], score=round(relevance[i], 4)) for i in selected]
@@ -0,0 +1,218 @@
+"""
+br / gzip response compression as a plain ASGI middleware.
+
+Self-contained on purpose: Starlette's GZipMiddleware changes its
+constructor and responder internals between releases, so this only relies
+on the ASGI message protocol.
+"""
+import os
+import zlib
+
+import anyio.to_thread
+
+from backend.app.utils.static_manifest import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))  # 11 is for build-time assets
+# single bodies above this are compressed on a worker thread, off the event loop
+COMPRESSION_THREAD_MIN_BYTES = int(os.getenv("COMPRESSION_THREAD_MIN_BYTES", str(128 * 1024)))
+
+# already compressed, or streamed message by message (SSE, ndjson progressive rendering)
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/x-ndjson",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "font/woff",
+    "font/woff2",
+    "image/*",
+    "audio/*",
+    "video/*",
+)
+
+
+# -------------------------------------------------
+# COMPRESSORS
+# -------------------------------------------------
+class GzipCompressor:
+    encoding = "gzip"
+
+    def __init__(self, level=GZIP_LEVEL):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        # sync-flush streamed chunks so the client can decode them as they arrive
+        return self._z.compress(data) + self._z.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliCompressor:
+    encoding = "br"
+
+    def __init__(self, quality=BROTLI_QUALITY):
+        self._b = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        out = self._b.process(data)
+        return out + (self._b.finish() if last else self._b.flush())
+
+
+def _is_excluded(content_type: str, excluded) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type in excluded or media_type.partition("/")[0] + "/*" in excluded
+
+
+def _header(headers, name: bytes) -> str:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _with_vary(headers) -> list:
+    vary = _header(headers, b"vary")
+    if "accept-encoding" in vary.lower():
+        return list(headers)
+
+    out = [(k, v) for k, v in headers if k.lower() != b"vary"]
+    out.append((b"vary", (vary + ", Accept-Encoding" if vary else "Accept-Encoding").encode()))
+    return out
+
+
+def _compressed_headers(headers, encoding: str, length=None) -> list:
+    out = [(k, v) for k, v in _with_vary(headers) if k.lower() != b"content-length"]
+    out.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        out.append((b"content-length", str(length).encode()))
+    return out
+
+
+# -------------------------------------------------
+# MIDDLEWARE
+# -------------------------------------------------
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli (when the client accepts it and the
+    `brotli` package is installed) or gzip. Small bodies, excluded content
+    types, partial content and responses that already carry a
+    Content-Encoding (precompressed static files) pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size=COMPRESSION_MIN_BYTES,
+        gzip_level=GZIP_LEVEL,
+        brotli_quality=BROTLI_QUALITY,
+        thread_minimum_size=COMPRESSION_THREAD_MIN_BYTES,
+        exclude_content_types=EXCLUDED_CONTENT_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+        self.exclude_content_types = frozenset(exclude_content_types)
+
+    def _compressor(self, scope):
+        accepted = accepted_encodings(_header(scope["headers"], b"accept-encoding"))
+
+        if brotli is not None and "br" in accepted:
+            return BrotliCompressor(self.brotli_quality)
+        if "gzip" in accepted:
+            return GzipCompressor(self.gzip_level)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        compressor = self._compressor(scope)
+        start = None      # held http.response.start until the first body chunk
+        passthrough = False
+        streaming = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough, streaming
+
+            kind = message["type"]
+
+            if kind == "http.response.start":
+                headers = message.get("headers", [])
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or bool(_header(headers, b"content-encoding"))
+                    or _is_excluded(_header(headers, b"content-type"), self.exclude_content_types)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if passthrough:
+                await send(message)
+                return
+
+            if kind != "http.response.body":
+                # e.g. http.response.pathsend: the server streams the file itself
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if streaming:
+                await send({
+                    "type": "http.response.body",
+                    "body": compressor.compress(body, last=not more_body),
+                    "more_body": more_body,
+                })
+                return
+
+            headers = start.get("headers", [])
+
+            if not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if compressor is None:
+                # another client may get this compressed, so caches must vary
+                passthrough = True
+                await send({**start, "headers": _with_vary(headers)})
+                await send(message)
+                return
+
+            if more_body:
+                streaming = True
+                await send({**start, "headers": _compressed_headers(headers, compressor.encoding)})
+                await send({
+                    "type": "http.response.body",
+                    "body": compressor.compress(body, last=False),
+                    "more_body": True,
+                })
+                return
+
+            if len(body) >= self.thread_minimum_size:
+                data = await anyio.to_thread.run_sync(compressor.compress, body, True)
+            else:
+                data = compressor.compress(body, True)
+
+            await send({**start, "headers": _compressed_headers(headers, compressor.encoding, len(data))})
+            await send({"type": "http.response.body", "body": data, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,79 +1,194 @@
-import requests
+import asyncio
+import logging
+import os
 
+import httpx
 
-def fetch_wikipedia_image(query: str):
-    print("\n===== IMAGE FETCH DEBUG =====")
-    print("Query:", query)
+from backend.app.utils.ttl_cache import TTLCache
 
-    try:
-        url = "https://en.wikipedia.org/w/api.php"
-
-        # STEP 1: SEARCH PAGE
-        search_params = {
-            "action": "query",
-            "list": "search",
-            "format": "json",
-            "srsearch": query
-        }
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+IMAGE_TIMEOUT_SECONDS = float(os.getenv("IMAGE_TIMEOUT_SECONDS", "3"))
+IMAGE_CONCURRENCY = int(os.getenv("IMAGE_CONCURRENCY", "8"))
+IMAGE_CACHE_TTL_SECONDS = int(os.getenv("IMAGE_CACHE_TTL_SECONDS", str(24 * 3600)))
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "2000"))
 
-        search_res = requests.get(url, params=search_params)
-        search_data = search_res.json()
+THUMB_SIZE = 500
+MAX_TITLES_PER_QUERY = 50  # MediaWiki limit for anonymous clients
 
-        results = search_data.get("query", {}).get("search", [])
+HEADERS = {"User-Agent": "IntelligentQuestionGenerator/1.0 (image lookup)"}
 
-        if not results:
-            print("❌ No search results")
-            return None
+logger = logging.getLogger(__name__)
 
-        page_title = results[0]["title"]
-        print("Page title:", page_title)
 
-        # STEP 2: GET IMAGE USING pageimages
-        image_params = {
-            "action": "query",
-            "format": "json",
-            "titles": page_title,
-            "prop": "pageimages",
-            "piprop": "thumbnail",
-            "pithumbsize": 500
-        }
+# -------------------------------------------------
+# ENTITY → IMAGE URL MEMO (includes negative results)
+# -------------------------------------------------
+image_cache = TTLCache(IMAGE_CACHE_TTL_SECONDS, IMAGE_CACHE_MAX_ENTRIES, name="image")
+
+
+# -------------------------------------------------
+# SHARED HTTP CLIENT
+# -------------------------------------------------
+_client = None
+
+
+def get_image_client() -> httpx.AsyncClient:
+    global _client
+
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=httpx.Timeout(IMAGE_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=IMAGE_CONCURRENCY,
+                max_keepalive_connections=IMAGE_CONCURRENCY
+            )
+        )
+
+    return _client
+
 
-        image_res = requests.get(url, params=image_params)
-        image_data = image_res.json()
+async def close_image_client():
+    global _client
 
-        pages = image_data.get("query", {}).get("pages", {})
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-        for page in pages.values():
-            if "thumbnail" in page:
-                image_url = page["thumbnail"]["source"]
-                print("✅ Image found:", image_url)
-                return image_url
 
-        print("⚠️ No thumbnail found, trying fallback...")
+async def _query(params: dict) -> dict:
+    response = await get_image_client().get(
+        WIKIPEDIA_API_URL,
+        params={"action": "query", "format": "json", **params}
+    )
+    response.raise_for_status()
+    return response.json()
 
-        # STEP 3: FALLBACK → use pageimages with original image
-        fallback_params = {
-            "action": "query",
-            "format": "json",
-            "titles": page_title,
+
+# -------------------------------------------------
+# MEDIAWIKI LOOKUPS
+# -------------------------------------------------
+def _page_image(page: dict):
+    if "thumbnail" in page:
+        return page["thumbnail"]["source"]
+    if "original" in page:
+        return page["original"]["source"]
+    return None
+
+
+async def _images_for_titles(titles: list) -> dict:
+    """
+    One `query` call per 50 titles: returns {requested_title: url or None}.
+    Thumbnail and original are asked for together, and normalisation and
+    redirects are followed back to the requested title.
+    """
+    result = {}
+
+    for i in range(0, len(titles), MAX_TITLES_PER_QUERY):
+        batch = titles[i:i + MAX_TITLES_PER_QUERY]
+        data = await _query({
+            "titles": "|".join(batch),
             "prop": "pageimages",
-            "piprop": "original"
+            "piprop": "thumbnail|original",
+            "pithumbsize": THUMB_SIZE,
+            "redirects": 1
+        })
+
+        query = data.get("query", {})
+        alias = {}
+        for item in query.get("normalized", []) + query.get("redirects", []):
+            alias[item["from"]] = item["to"]
+
+        images = {
+            page.get("title"): _page_image(page)
+            for page in query.get("pages", {}).values()
+            if "missing" not in page
         }
 
-        fallback_res = requests.get(url, params=fallback_params)
-        fallback_data = fallback_res.json()
+        for title in batch:
+            final = title
+            while final in alias and alias[final] != final:
+                final = alias[final]
+            result[title] = images.get(final)
+
+    return result
 
-        pages = fallback_data.get("query", {}).get("pages", {})
 
-        for page in pages.values():
-            if "original" in page:
-                image_url = page["original"]["source"]
-                print("✅ Fallback image:", image_url)
-                return image_url
+async def _search_title(query: str):
+    data = await _query({
+        "list": "search",
+        "srsearch": query,
+        "srlimit": 1
+    })
 
-        print("❌ No image found even in fallback")
+    results = data.get("query", {}).get("search", [])
+    return results[0]["title"] if results else None
 
-    except Exception as e:
-        print("❌ Error:", e)
 
-    return None
\ No newline at end of file
+async def fetch_images(entities: list) -> dict:
+    """
+    Resolve many entities to image URLs at once: {entity: url or None}.
+
+    1. serve memoized answers (positive and negative)
+    2. try all remaining entities as exact page titles in one batch call
+    3. search the misses concurrently, then batch-fetch their images
+    """
+    result = {}
+    pending = []
+
+    for entity in dict.fromkeys(e for e in entities if e):
+        found, url = image_cache.get(entity)
+        if found:
+            result[entity] = url
+        else:
+            pending.append(entity)
+
+    if not pending:
+        return result
+
+    try:
+        direct = await _images_for_titles(pending)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning("image lookup failed", extra={"error": str(e)})
+        return {**result, **{entity: None for entity in pending}}
+
+    misses = [entity for entity in pending if not direct.get(entity)]
+    semaphore = asyncio.Semaphore(IMAGE_CONCURRENCY)
+    failed = set()  # transient errors are not memoized
+
+    async def search(entity):
+        async with semaphore:
+            try:
+                return await _search_title(entity)
+            except (httpx.HTTPError, ValueError):
+                failed.add(entity)
+                return None
+
+    titles = await asyncio.gather(*(search(entity) for entity in misses))
+    found_titles = {entity: title for entity, title in zip(misses, titles) if title}
+
+    searched = {}
+    if found_titles:
+        try:
+            searched = await _images_for_titles(list(dict.fromkeys(found_titles.values())))
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("image lookup failed", extra={"error": str(e)})
+            failed.update(found_titles)
+
+    for entity in pending:
+        url = direct.get(entity)
+        if not url and entity in found_titles:
+            url = searched.get(found_titles[entity])
+
+        result[entity] = url
+        if entity not in failed:
+            image_cache.set(entity, url)
+
+    return result
+
+
+async def fetch_wikipedia_image(query: str):
+    return (await fetch_images([query])).get(query)
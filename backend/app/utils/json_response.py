@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj):
+    """Types orjson does not know natively (datetimes, dicts, lists it does)."""
+
+    # ✅ SQLAlchemy rows: loaded attributes, like FastAPI's jsonable_encoder
+    if hasattr(obj, "_sa_instance_state"):
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_sa")}
+
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+
+    if isinstance(obj, Decimal):
+        return float(obj)
+
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON rendered by orjson. Returned directly from a route it also skips
+    FastAPI's jsonable_encoder pass over the payload.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(content, status_code: int = 200, headers=None) -> FastJSONResponse:
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
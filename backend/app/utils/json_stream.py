@@ -0,0 +1,86 @@
+import json
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a JSON array of objects arriving in pieces.
+
+    Feed it text as the LLM streams it; every top-level object is returned
+    as soon as its closing brace arrives. Anything before the first "["
+    (markdown fences, chatter) is ignored, and objects that fail to parse
+    are skipped instead of aborting the whole stream.
+    """
+
+    def __init__(self):
+        self._buffer = []       # characters of the object being read
+        self._started = False   # seen the opening "[" of the array
+        self._finished = False  # seen the closing "]" of the array
+        self._depth = 0         # nesting depth inside the current object
+        self._in_string = False
+        self._escape = False
+        self.skipped = 0
+
+    def feed(self, text: str) -> list:
+        objects = []
+
+        for ch in text:
+            if self._finished:
+                break
+
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                continue
+
+            # ---------------- OUTSIDE ANY OBJECT ----------------
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buffer = [ch]
+                elif ch == "]":
+                    self._finished = True
+                continue
+
+            # ---------------- INSIDE AN OBJECT ----------------
+            self._buffer.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+
+                if self._depth == 0:
+                    obj = self._decode("".join(self._buffer))
+                    self._buffer = []
+                    if obj is not None:
+                        objects.append(obj)
+
+        return objects
+
+    def _decode(self, raw: str):
+        try:
+            obj = json.loads(raw)
+        except ValueError:
+            # same fallback as safe_json_loads
+            try:
+                obj = json.loads(raw.replace("\n", " ").replace("\t", " "))
+            except ValueError:
+                self.skipped += 1
+                return None
+
+        if not isinstance(obj, dict):
+            self.skipped += 1
+            return None
+
+        return obj
@@ -1,8 +1,169 @@
-import fitz  # PyMuPDF
-
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
-    text = ""
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Documents with at least this many selected pages are split across processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "150"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+# never "fork": the server process has an event loop, threads and open
+# DB / HTTP connections that a forked child would inherit mid-use
+PDF_START_METHOD = os.getenv(
+    "PDF_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_executor = None
+
+
+def _open_pdf(pdf_bytes: bytes):
+    # PyMuPDF is imported on first use: it is the slowest import in the app
+    import fitz  # PyMuPDF
+
+    return fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+# -----------------------------------------
+# PAGE RANGE SELECTION
+# -----------------------------------------
+def find_chapter_range(doc, chapter: str):
+    """
+    Look up `chapter` in the PDF outline (table of contents).
+
+    Matches a case-insensitive substring of the outline title and returns
+    the 1-based inclusive (start, end) page range up to the next entry at
+    the same or a higher level.
+    """
+    toc = doc.get_toc()
+    needle = chapter.strip().lower()
+
+    for i, (level, title, page) in enumerate(toc):
+        if needle not in title.lower():
+            continue
+
+        end = doc.page_count
+        for next_level, _, next_page in toc[i + 1:]:
+            if next_level <= level:
+                end = max(page, next_page - 1)
+                break
+
+        return page, end
+
+    raise ValueError(f"Chapter not found in PDF outline: {chapter}")
+
+
+def resolve_page_range(doc, start_page=None, end_page=None, chapter=None):
+    """Return a 0-based half-open (start, stop) page range for `doc`."""
+    if chapter:
+        start_page, end_page = find_chapter_range(doc, chapter)
+
+    start = (start_page or 1) - 1
+    stop = end_page or doc.page_count
+
+    if start < 0 or start >= doc.page_count:
+        raise ValueError(f"start_page must be between 1 and {doc.page_count}")
+    if stop < start + 1:
+        raise ValueError("end_page must not be before start_page")
+
+    return start, min(stop, doc.page_count)
+
+
+# -----------------------------------------
+# STREAMING EXTRACTION
+# -----------------------------------------
+def iter_pdf_pages(pdf_bytes: bytes, start_page=None, end_page=None, chapter=None):
+    """
+    Yield (page_number, text) for each selected page as soon as it is
+    decoded. Page numbers are 1-based.
+    """
+    with _open_pdf(pdf_bytes) as doc:
+        start, stop = resolve_page_range(doc, start_page, end_page, chapter)
+
+        for index in range(start, stop):
+            yield index + 1, doc.load_page(index).get_text()
+
+
+# -----------------------------------------
+# PARALLEL EXTRACTION (big documents)
+# -----------------------------------------
+def _extract_range(pdf_bytes: bytes, start: int, stop: int) -> list:
+    # runs in a worker process: every worker opens its own document
+    with _open_pdf(pdf_bytes) as doc:
+        return [
+            (index + 1, doc.load_page(index).get_text())
+            for index in range(start, stop)
+        ]
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        # workers only need this module (and the lazy fitz import)
+        _executor = ProcessPoolExecutor(
+            max_workers=max(1, PDF_WORKERS),
+            mp_context=multiprocessing.get_context(PDF_START_METHOD)
+        )
+
+    return _executor
+
+
+def shutdown_pdf_executor():
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def extract_pages_parallel(pdf_bytes: bytes, start: int, stop: int, workers=None) -> list:
+    """Split [start, stop) into contiguous ranges and extract them on a process pool."""
+    workers = max(1, workers or PDF_WORKERS)
+    step = max(1, -(-(stop - start) // workers))  # ceil division
+
+    futures = [
+        _get_executor().submit(_extract_range, pdf_bytes, s, min(s + step, stop))
+        for s in range(start, stop, step)
+    ]
+
+    pages = []
+    for future in futures:  # submission order == page order
+        pages.extend(future.result())
+
+    return pages
+
+
+# -----------------------------------------
+# PUBLIC HELPERS
+# -----------------------------------------
+def iter_selected_pages(pdf_bytes: bytes, start_page=None, end_page=None, chapter=None,
+                        parallel=None):
+    """
+    (page_number, text) for the selected pages. Sequential extraction is
+    lazy, one decoded page at a time; the process pool returns a list.
+    Range errors are raised here, not on first iteration.
+
+    With parallel=None the process pool is used automatically once the
+    selection reaches PDF_PARALLEL_MIN_PAGES pages.
+    """
+    with _open_pdf(pdf_bytes) as doc:
+        start, stop = resolve_page_range(doc, start_page, end_page, chapter)
+
+    if parallel is None:
+        parallel = PDF_WORKERS > 1 and (stop - start) >= PDF_PARALLEL_MIN_PAGES
+
+    if parallel:
+        return extract_pages_parallel(pdf_bytes, start, stop)
+
+    return iter_pdf_pages(pdf_bytes, start + 1, stop)
+
+
+def extract_pages(pdf_bytes: bytes, start_page=None, end_page=None, chapter=None,
+                  parallel=None) -> list:
+    """Return [(page_number, text), ...] for the selected pages."""
+    return list(iter_selected_pages(pdf_bytes, start_page, end_page, chapter, parallel))
+
+
+def extract_text_from_pdf(pdf_bytes: bytes, start_page=None, end_page=None,
+                          chapter=None, parallel=None) -> str:
+    pages = extract_pages(pdf_bytes, start_page, end_page, chapter, parallel)
+    return "".join(text for _, text in pages)
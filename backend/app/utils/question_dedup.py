@@ -0,0 +1,129 @@
+import os
+import random
+import re
+import zlib
+
+# Jaccard similarity (over character shingles) at which two questions
+# count as the same question
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.6"))
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+NUM_BANDS = 16  # 4 rows per band → candidate pairs from ~0.5 similarity up
+
+_MERSENNE = (1 << 61) - 1
+_NON_WORD_RE = re.compile(r"[^a-z0-9 ]+")
+
+# fixed seed: signatures must be comparable across calls
+_rng = random.Random(1234)
+_PERMS = [
+    (_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE))
+    for _ in range(NUM_PERM)
+]
+
+
+def normalize(text: str) -> str:
+    text = _NON_WORD_RE.sub(" ", text.lower())
+    return " ".join(text.split())
+
+
+def shingles(text: str) -> set:
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class QuestionDeduplicator:
+    """
+    Incremental near-duplicate filter for question texts.
+
+    Questions are shingled into character 5-grams, MinHash-signed and
+    bucketed with LSH banding, so each new question is compared only with
+    the few earlier questions that share a band. Candidates are confirmed
+    with exact Jaccard similarity. Cost is linear in the number of
+    questions.
+    """
+
+    def __init__(self, threshold=DEDUP_THRESHOLD, num_bands=NUM_BANDS, exclude=None):
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.rows = NUM_PERM // num_bands
+
+        self._buckets = [{} for _ in range(num_bands)]
+        self._shingles = []
+        self.accepted = []
+        self.removed = 0
+
+        # questions the client already has: never returned again
+        for text in exclude or []:
+            self.remember(text)
+
+    def _signature(self, items: set) -> list:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in items]
+        return [
+            min((a * h + b) % _MERSENNE for h in hashes)
+            for a, b in _PERMS
+        ]
+
+    def _band_keys(self, signature):
+        for band in range(self.num_bands):
+            start = band * self.rows
+            yield band, tuple(signature[start:start + self.rows])
+
+    def is_duplicate(self, text: str, items=None, signature=None) -> bool:
+        items = items if items is not None else shingles(text)
+        signature = signature or self._signature(items)
+
+        seen = set()
+        for band, key in self._band_keys(signature):
+            for idx in self._buckets[band].get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                if jaccard(items, self._shingles[idx]) >= self.threshold:
+                    return True
+
+        return False
+
+    def remember(self, text: str):
+        """Register `text` without counting it as accepted output (e.g. excludes)."""
+        self._add(text, shingles(text), None)
+
+    def _add(self, text, items, signature):
+        signature = signature or self._signature(items)
+        idx = len(self._shingles)
+        self._shingles.append(items)
+
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(idx)
+
+    def add(self, text: str) -> bool:
+        """Keep `text` if it is new; returns False (and counts it) when it is a duplicate."""
+        items = shingles(text)
+        signature = self._signature(items)
+
+        if self.is_duplicate(text, items, signature):
+            self.removed += 1
+            return False
+
+        self._add(text, items, signature)
+        self.accepted.append(text)
+        return True
+
+    def filter(self, questions: list) -> list:
+        """
+        Keep the question dicts whose "question" text is new. Anything that
+        is not a dict (malformed model output) is dropped, not fingerprinted.
+        """
+        return [
+            q for q in questions
+            if isinstance(q, dict) and self.add(str(q.get("question", "")))
+        ]
+
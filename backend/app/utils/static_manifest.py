@@ -0,0 +1,165 @@
+import hashlib
+import mimetypes
+import os
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+# Vite writes content-hashed file names under assets/, so they never change
+HASHED_ASSETS_PREFIX = "assets/"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# preference order when the client accepts several
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+INDEX_FILE = "index.html"
+
+
+class StaticFile:
+    """One file of the build plus its precompressed siblings."""
+
+    __slots__ = ("path", "stat", "media_type", "etag", "cache_control", "variants")
+
+    def __init__(self, path, stat, media_type, etag, cache_control):
+        self.path = path
+        self.stat = stat
+        self.media_type = media_type
+        self.etag = etag
+        self.cache_control = cache_control
+        self.variants = {}  # encoding → (path, stat, etag)
+
+
+def _digest(path: str) -> str:
+    h = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def accepted_encodings(header: str) -> set:
+    """Content codings from Accept-Encoding, minus the ones sent with q=0."""
+    accepted = set()
+
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+
+        if name and q > 0:
+            accepted.add(name)
+
+    if "*" in accepted:
+        accepted.update(encoding for encoding, _ in ENCODINGS)
+
+    return accepted
+
+
+def _etag_matches(header: str, etags) -> bool:
+    if header.strip() == "*":
+        return True
+
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+
+    return False
+
+
+# -------------------------------------------------
+# MANIFEST
+# -------------------------------------------------
+class StaticManifest:
+    """
+    The frontend build indexed once (paths, sizes, ETags, .br/.gz siblings),
+    so serving a file needs no os.path / stat calls and a revalidation hit
+    never touches the disk.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files = {}
+
+    def load(self):
+        files = {}
+
+        for folder, _, names in os.walk(self.root):
+            for name in names:
+                full = os.path.join(folder, name)
+                rel = os.path.relpath(full, self.root).replace(os.sep, "/")
+
+                if any(rel.endswith(suffix) and os.path.exists(full[:-len(suffix)])
+                       for _, suffix in ENCODINGS):
+                    continue  # picked up as a variant of the original below
+
+                digest = _digest(full)
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                cache_control = (
+                    IMMUTABLE_CACHE if rel.startswith(HASHED_ASSETS_PREFIX) else REVALIDATE_CACHE
+                )
+                entry = StaticFile(full, os.stat(full), media_type, f'"{digest}"', cache_control)
+
+                for encoding, suffix in ENCODINGS:
+                    if os.path.isfile(full + suffix):
+                        entry.variants[encoding] = (
+                            full + suffix, os.stat(full + suffix), f'"{digest}-{encoding}"'
+                        )
+
+                files[rel] = entry
+
+        self.files = files
+        return self
+
+    def lookup(self, path: str):
+        path = path.strip("/") or INDEX_FILE
+        entry = self.files.get(path)
+
+        # ✅ client-side routes fall back to the SPA shell; missing assets are real 404s
+        if entry is None and not path.startswith(HASHED_ASSETS_PREFIX):
+            entry = self.files.get(INDEX_FILE)
+
+        return entry
+
+    def response(self, request: Request, path: str) -> Response:
+        entry = self.lookup(path)
+        if entry is None:
+            raise HTTPException(404, "Not found")
+
+        file_path, stat, etag, encoding = entry.path, entry.stat, entry.etag, None
+
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for candidate, _ in ENCODINGS:
+            if candidate in accepted and candidate in entry.variants:
+                file_path, stat, etag = entry.variants[candidate]
+                encoding = candidate
+                break
+
+        headers = {"ETag": etag, "Cache-Control": entry.cache_control}
+        if entry.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, {etag}):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        return FileResponse(
+            file_path, headers=headers, media_type=entry.media_type, stat_result=stat
+        )
@@ -1,10 +1,171 @@
-def chunk_text(text: str, chunk_size=1500, overlap=300) -> list[str]:
+import os
+import re
+from functools import lru_cache
+
+# Token budget for the CONTENT part of one prompt; chunks are sized to it
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "800"))
+CHUNK_OVERLAP_SENTENCES = int(os.getenv("CHUNK_OVERLAP_SENTENCES", "1"))
+
+# Word pieces + punctuation: a close, dependency-free estimate of BPE tokens
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_PARAGRAPH_RE = re.compile(r"\S(?:.*?\S)?(?=\s*\n\s*\n|\s*\Z)", re.S)
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?](?=\s|\Z)|\Z)", re.S)
+
+
+@lru_cache(maxsize=1)
+def _punkt():
+    """
+    Untrained Punkt needs no downloaded data and handles abbreviations
+    better than the regex fallback. nltk is slow to import, so it is loaded
+    on the first PDF instead of at startup.
+    """
+    try:
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+    except ImportError:  # pragma: no cover - nltk is optional at runtime
+        return None
+    return PunktSentenceTokenizer()
+
+
+# -----------------------------------------
+# TOKENS
+# -----------------------------------------
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` after `max_tokens` tokens (no-op when it already fits)."""
+    for i, match in enumerate(_TOKEN_RE.finditer(text)):
+        if i == max_tokens:
+            return text[:match.start()].rstrip()
+    return text
+
+
+# -----------------------------------------
+# SENTENCES
+# -----------------------------------------
+def _sentence_spans(text: str):
+    punkt = _punkt()
+    if punkt is not None:
+        return punkt.span_tokenize(text)
+    return ((m.start(), m.end()) for m in _SENTENCE_RE.finditer(text))
+
+
+def _split_long(text: str, start: int, max_tokens: int):
+    """Break a single over-long sentence into token-sized pieces."""
+    matches = list(_TOKEN_RE.finditer(text))
+
+    for i in range(0, len(matches), max_tokens):
+        piece = matches[i:i + max_tokens]
+        s, e = piece[0].start(), piece[-1].end()
+        yield text[s:e], start + s, start + e, len(piece)
+
+
+def iter_sentences(pages, max_tokens=CHUNK_MAX_TOKENS):
+    """
+    Yield sentence units from [(page_number, text), ...].
+
+    Each unit is a dict with the sentence text, its page, character
+    offsets into the concatenated document text, its token count and
+    whether it starts a new paragraph.
+    """
+    base = 0
+
+    for page_number, page_text in pages:
+        for para in _PARAGRAPH_RE.finditer(page_text):
+            first = True
+
+            for s, e in _sentence_spans(para.group()):
+                sentence = para.group()[s:e].strip()
+                if not sentence:
+                    continue
+
+                start = base + para.start() + s
+                tokens = count_tokens(sentence)
+
+                if tokens > max_tokens:
+                    parts = _split_long(sentence, start, max_tokens)
+                else:
+                    parts = [(sentence, start, start + len(sentence), tokens)]
+
+                for text, p_start, p_end, p_tokens in parts:
+                    yield {
+                        "text": " ".join(text.split()),
+                        "page": page_number,
+                        "start": p_start,
+                        "end": p_end,
+                        "tokens": p_tokens,
+                        "paragraph_start": first,
+                    }
+                    first = False
+
+        base += len(page_text)
+
+
+# -----------------------------------------
+# CHUNKS
+# -----------------------------------------
+def _make_chunk(units):
+    parts = []
+    for i, unit in enumerate(units):
+        if i and unit["paragraph_start"]:
+            parts.append("\n\n")
+        elif i:
+            parts.append(" ")
+        parts.append(unit["text"])
+
+    return {
+        "text": "".join(parts),
+        "start_page": units[0]["page"],
+        "end_page": units[-1]["page"],
+        "start_offset": units[0]["start"],
+        "end_offset": units[-1]["end"],
+        "tokens": sum(u["tokens"] for u in units),
+    }
+
+
+def chunk_pages(pages, max_tokens=CHUNK_MAX_TOKENS,
+                overlap_sentences=CHUNK_OVERLAP_SENTENCES) -> list[dict]:
+    """
+    Pack whole sentences into chunks of at most `max_tokens` tokens.
+
+    Consecutive chunks share the last `overlap_sentences` sentences. Each
+    chunk carries its text, page range, character offsets and token count.
+    """
     chunks = []
-    start = 0
+    current = []
+    current_tokens = 0
+
+    for unit in iter_sentences(pages, max_tokens):
+        if current and current_tokens + unit["tokens"] > max_tokens:
+            chunks.append(_make_chunk(current))
+
+            # ✅ carry a few sentences over, but never more than half a chunk
+            # and never so many that the next sentence no longer fits
+            carry = current[-overlap_sentences:] if overlap_sentences > 0 else []
+            while carry:
+                carry_tokens = sum(u["tokens"] for u in carry)
+                if carry_tokens <= max_tokens // 2 and \
+                        carry_tokens + unit["tokens"] <= max_tokens:
+                    break
+                carry = carry[1:]
 
-    while start < len(text):
-        end = start + chunk_size
-        chunks.append(text[start:end])
-        start = end - overlap
+            current = list(carry)
+            current_tokens = sum(u["tokens"] for u in current)
+
+        current.append(unit)
+        current_tokens += unit["tokens"]
+
+    # skip a trailing chunk made only of overlap from the previous one
+    if current and (not chunks or current[-1]["end"] > chunks[-1]["end_offset"]):
+        chunks.append(_make_chunk(current))
 
     return chunks
+
+
+def chunk_text(text: str, max_tokens=CHUNK_MAX_TOKENS,
+               overlap_sentences=CHUNK_OVERLAP_SENTENCES) -> list[str]:
+    return [
+        chunk["text"]
+        for chunk in chunk_pages([(1, text)], max_tokens, overlap_sentences)
+    ]
@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+
+from backend.app.core.metrics import CACHE_REQUESTS
+
+
+class TTLCache:
+    """
+    Thread-safe LRU memo whose entries expire `ttl` seconds after being set.
+    A `name` reports hits and misses as cache_requests_total{cache=name}.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, name: str = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (found, value); value may be None for a cached miss."""
+        found, value = self._get(key)
+
+        if self.name:
+            CACHE_REQUESTS.inc(self.name, "hit" if found else "miss")
+
+        return found, value
+
+    def _get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return False, None
+
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
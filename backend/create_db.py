@@ -1,6 +1,15 @@
-from backend.app.db.database import engine
-from backend.app.models.user_model import Base
+"""
+Create or upgrade the database schema through the versioned migrations
+(same as `python -m backend.app.db.migrations`):
 
-print("Creating database tables...")
-Base.metadata.create_all(bind=engine)
-print("Done!")
\ No newline at end of file
+    python -m backend.create_db
+"""
+from backend.app.core.logger import setup_logging, stop_logging
+from backend.app.db.migrations import run_migrations
+
+if __name__ == "__main__":
+    setup_logging()
+    try:
+        run_migrations()
+    finally:
+        stop_logging()
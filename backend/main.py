@@ -1,20 +1,33 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 
 from backend.app.api.question_routes import router as question_router
 from backend.app.api.auth_routes import router as auth_router
 from backend.app.api.institute_routes import router as institute_router  # ✅ NEW
 
 # DATABASE IMPORTS
-from backend.app.db.database import Base, engine
-import backend.app.models 
+from backend.app.db.database import async_engine
+from backend.app.db.migrations import RUN_MIGRATIONS_ON_STARTUP, run_migrations
 import os
 from backend.app.api.dashboard_routes import router as dashboard_router
 from backend.app.api.question_paper_routes import router as paper_router
-from backend.app.models.notification_model import Notification
 from backend.app.api.notification_routes import router as notification_router
+from backend.app.services.llm_providers import close_llm_provider, get_llm_provider
+from backend.app.utils.pdf_utils import shutdown_pdf_executor
+from backend.app.utils.image_fetcher import close_image_client, get_image_client
+from backend.app.api.job_routes import router as job_router
+from backend.app.services.job_queue import job_queue
+from backend.app.core.security import password_hasher
+from backend.app.core.principal import revoked_users
+from backend.app.utils.static_manifest import StaticManifest
+from backend.app.utils.json_response import FastJSONResponse
+from backend.app.utils.compression import CompressionMiddleware
+from backend.app.core.metrics import MetricsMiddleware
+from backend.app.core.logger import RequestContextMiddleware, setup_logging, stop_logging
+from backend.app.api.metrics_routes import router as metrics_router
 
 
 
@@ -23,15 +36,41 @@ from backend.app.api.notification_routes import router as notification_router
 # Create FastAPI App
 # -------------------------------------------------
 
-app = FastAPI(
-    title="Intelligent Question Generation System using NLP and LLMs"
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ✅ JSON logs through a background thread
+    setup_logging()
+    # ✅ schema: normally applied once per deploy (python -m backend.app.db.migrations);
+    # on by default so a fresh local checkout still works
+    if RUN_MIGRATIONS_ON_STARTUP:
+        await asyncio.to_thread(run_migrations)
+    # ✅ pooled HTTP clients, created here rather than at import
+    get_llm_provider()
+    get_image_client()
+    # ✅ start job workers (re-queues jobs left over from a restart)
+    await job_queue.start()
+    # ✅ deactivated users, checked on every authenticated request
+    await revoked_users.start()
+    # ✅ index the React build once (ETags, .br/.gz variants)
+    if serve_frontend:
+        await asyncio.to_thread(frontend_manifest.load)
+    yield
+    await revoked_users.stop()
+    await job_queue.stop()
+    # ✅ release the pooled LLM HTTP connections
+    await close_llm_provider()
+    await close_image_client()
+    shutdown_pdf_executor()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    stop_logging()
 
-# -------------------------------------------------
-# CREATE DATABASE TABLES (IMPORTANT)
-# -------------------------------------------------
 
-Base.metadata.create_all(bind=engine)
+app = FastAPI(
+    title="Intelligent Question Generation System using NLP and LLMs",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse  # ✅ orjson
+)
 
 # -------------------------------------------------
 # CORS CONFIGURATION (IMPORTANT)
@@ -49,8 +88,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID"],  # ✅ pagination cursor, log correlation
 )
 
+# ✅ br / gzip for JSON payloads above COMPRESSION_MIN_BYTES
+app.add_middleware(CompressionMiddleware)
+
+# Starlette wraps in reverse order of add_middleware: the last one added is
+# the outermost, so requests pass RequestContext → Metrics → Compression → CORS
+
+# ✅ in-flight gauge + per-route latency (times compression, CORS and the routes)
+app.add_middleware(MetricsMiddleware)
+
+# ✅ request id on every log record (outermost, so metrics and everything below see it)
+app.add_middleware(RequestContextMiddleware)
+
 # -------------------------------------------------
 # INCLUDE ROUTES
 # -------------------------------------------------
@@ -61,28 +113,21 @@ app.include_router(institute_router)
 app.include_router(dashboard_router)
 app.include_router(paper_router)
 app.include_router(notification_router)
+app.include_router(job_router)
+app.include_router(metrics_router)
 
 # -------------------------------------------------
 # SERVE REACT FRONTEND (PRODUCTION BUILD)
 # -------------------------------------------------
 
 frontend_path = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "dist")
+    os.path.join(os.path.dirname(__file__), "..", "frontend", "dist")
 )
+frontend_manifest = StaticManifest(frontend_path)
+serve_frontend = os.path.isdir(frontend_path)
 
-if os.path.exists(frontend_path):
-
-    app.mount(
-        "/assets",
-        StaticFiles(directory=os.path.join(frontend_path, "assets")),
-        name="assets"
-    )
-
-    @app.get("/{full_path:path}")
-    async def serve_react_app(full_path: str):
-        file_path = os.path.join(frontend_path, full_path)
-
-        if os.path.exists(file_path):
-            return FileResponse(file_path)
+if serve_frontend:
 
-        return FileResponse(os.path.join(frontend_path, "index.html"))
\ No newline at end of file
+    @app.get("/{full_path:path}", include_in_schema=False)
+    async def serve_react_app(full_path: str, request: Request):
+        return frontend_manifest.response(request, full_path)
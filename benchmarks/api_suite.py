@@ -0,0 +1,620 @@
+"""
+End-to-end API benchmark: throughput, p50/p95/p99 latency and peak memory
+for the main endpoints, in-process (httpx ASGI transport) and/or over HTTP
+(a uvicorn subprocess).
+
+Everything external is local and deterministic:
+  - the fake LLM provider (FAKE_LLM_LATENCY per call, LLM cache off)
+  - a fake MediaWiki API on a local port (--wiki-latency per call)
+  - synthetic PDFs of --pdf-pages pages
+  - a freshly migrated SQLite database seeded with one institute, a COE,
+    --faculty faculty users, --papers papers (10 questions each) and
+    --notifications notifications per faculty; each mode gets its own copy
+
+Results are written as JSON (--output). Pass an earlier file as --compare
+to print the differences and exit 1 when p95 latency or throughput
+regress by more than --threshold.
+
+    python -m benchmarks.api_suite --mode both --output bench.json
+    python -m benchmarks.api_suite --compare bench.json --scenarios papers_list auth_login
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "bench-password"
+QUESTIONS_PER_PAPER = 10
+
+WORDS = (
+    "cell membrane protein enzyme energy light water carbon oxygen glucose "
+    "nucleus gene mutation evolution species habitat climate pressure force "
+    "velocity momentum circuit voltage current resistance magnet field wave "
+    "frequency atom molecule bond reaction acid base salt crystal metal"
+).split()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# -------------------------------------------------
+# PEAK MEMORY (Linux /proc, getrusage fallback for this process)
+# -------------------------------------------------
+def reset_peak_rss(pid):
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")  # resets VmHWM
+    except OSError:
+        pass
+
+
+def peak_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+
+    if pid == os.getpid():
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return None
+
+
+# -------------------------------------------------
+# FAKE MEDIAWIKI
+# -------------------------------------------------
+class FakeMediaWiki:
+    """
+    Answers the two queries image_fetcher makes: `list=search` and
+    `prop=pageimages` for a batch of titles. Every third title has no page
+    image, so the search fallback is exercised too.
+    """
+
+    def __init__(self, latency=0.0):
+        latency_seconds = latency
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                time.sleep(latency_seconds)
+
+                if params.get("list") == "search":
+                    term = params.get("srsearch", "")
+                    body = {"query": {"search": [{"title": term.title()}] if term else []}}
+                else:
+                    pages = {}
+                    for i, title in enumerate(params.get("titles", "").split("|")):
+                        page = {"title": title}
+                        if sum(map(ord, title)) % 3:
+                            page["thumbnail"] = {"source": f"https://img.local/{i}.png"}
+                        pages[str(-i - 1)] = page
+                    body = {"query": {"pages": pages}}
+
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/w/api.php"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# -------------------------------------------------
+# SYNTHETIC DATA
+# -------------------------------------------------
+def _sentence(rng):
+    words = rng.choices(WORDS, k=rng.randint(8, 18))
+    return " ".join(words).capitalize() + "."
+
+
+def make_pdf(pages: int, seed=0) -> bytes:
+    import fitz  # PyMuPDF
+
+    rng = random.Random(seed + pages)
+    doc = fitz.open()
+
+    for number in range(pages):
+        page = doc.new_page()
+        text = f"Chapter {number // 10 + 1}\n\n" + " ".join(_sentence(rng) for _ in range(28))
+        page.insert_textbox(fitz.Rect(50, 50, 545, 790), text, fontsize=10)
+
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_question(rng, i):
+    if i % 2:
+        return {
+            "question": _sentence(rng).rstrip(".") + "?",
+            "options": [_sentence(rng) for _ in range(4)],
+            "correct_answer": "A",
+        }
+    return {
+        "question": "Explain " + _sentence(rng).lower(),
+        "model_answer": " ".join(_sentence(rng) for _ in range(3)),
+        "key_points": [_sentence(rng) for _ in range(3)],
+        "expected_keywords": rng.sample(WORDS, 5),
+    }
+
+
+def seed_database(url, faculty, papers, notifications, seed=0) -> dict:
+    """Migrate and fill a database; returns the ids the scenarios need."""
+    from datetime import datetime, timedelta
+
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.app.core.security import hash_password
+    from backend.app.db.database import make_engine
+    from backend.app.db.migrations import run_migrations
+    from backend.app.models import Institute, Notification, Question, QuestionPaper, User
+    from backend.app.models.question_model import question_from_dict
+
+    rng = random.Random(seed)
+    engine = make_engine(url)
+    run_migrations(engine)
+
+    hashed = hash_password(PASSWORD)
+    session = sessionmaker(bind=engine)()
+
+    try:
+        institute = Institute(name="Benchmark Institute")
+        session.add(institute)
+        session.flush()
+
+        coe = User(first_name="Bench", last_name="COE", username="bench_coe", password=hashed,
+                   role="coe", institute_id=institute.id)
+        faculty_users = [
+            User(first_name="Bench", last_name=f"F{i}", username=f"bench_faculty_{i}",
+                 password=hashed, role="faculty", institute_id=institute.id)
+            for i in range(faculty)
+        ]
+        session.add_all([coe, *faculty_users])
+        session.flush()
+
+        start = datetime(2026, 1, 1)
+        for n in range(papers):
+            paper = QuestionPaper(
+                title=f"Paper {n}",
+                faculty_id=faculty_users[n % faculty].id,
+                institute_id=institute.id,
+                status=("pending", "approved", "rejected")[n % 3],
+                created_at=start + timedelta(minutes=13 * n),
+            )
+            paper.questions = [
+                Question(**question_from_dict(make_question(rng, q), q, "medium"))
+                for q in range(QUESTIONS_PER_PAPER)
+            ]
+            session.add(paper)
+
+        for user in faculty_users:
+            session.add_all(
+                Notification(faculty_id=user.id, message=f"Paper {n} was reviewed", is_read=bool(n % 2))
+                for n in range(notifications)
+            )
+
+        session.commit()
+
+        return {
+            "institute_id": institute.id,
+            "coe": {"id": coe.id, "username": coe.username, "institute_id": institute.id},
+            "faculty": [
+                {"id": u.id, "username": u.username, "institute_id": institute.id}
+                for u in faculty_users
+            ],
+            "paper_ids": [p for (p,) in session.query(QuestionPaper.id).all()],
+        }
+    finally:
+        session.close()
+        engine.dispose()
+
+
+# -------------------------------------------------
+# SCENARIOS
+# -------------------------------------------------
+class Scenario:
+    def __init__(self, name, send, requests):
+        self.name = name
+        self.send = send          # async (client, i) -> httpx.Response
+        self.requests = requests
+
+
+def build_scenarios(args, data, pdfs) -> list:
+    from backend.app.core.principal import token_claims
+    from backend.app.core.security import create_access_token
+
+    def bearer(user, role):
+        claims = token_claims(SimpleNamespace(id=user["id"], role=role, institute_id=user["institute_id"]))
+        return {"Authorization": f"Bearer {create_access_token(claims)}"}
+
+    coe_headers = bearer(data["coe"], "coe")
+    faculty = data["faculty"]
+    faculty_headers = [bearer(f, "faculty") for f in faculty]
+    paper_ids = data["paper_ids"]
+    institute_id = data["institute_id"]
+    question_rng = random.Random(args.seed)
+    submit_questions = [make_question(question_rng, i) for i in range(QUESTIONS_PER_PAPER)]
+
+    async def auth_login(client, i):
+        user = faculty[i % len(faculty)]
+        return await client.post("/auth/login", json={
+            "username": user["username"], "password": PASSWORD, "role": "faculty"
+        })
+
+    async def generate_text(client, i):
+        return await client.post("/generate-questions", json={
+            "topic": f"{WORDS[i % len(WORDS)]} {i}", "num_questions": 5
+        })
+
+    async def generate_text_images(client, i):
+        return await client.post("/generate-questions", json={
+            "topic": f"{WORDS[i % len(WORDS)]} {i}", "num_questions": 5, "include_images": True
+        })
+
+    def generate_pdf(pdf):
+        async def send(client, i):
+            return await client.post(
+                "/generate-questions-from-pdf",
+                params={"num_questions": 5, "topic": WORDS[i % len(WORDS)]},
+                files={"file": ("bench.pdf", pdf, "application/pdf")},
+            )
+        return send
+
+    async def papers_list(client, i):
+        return await client.get(f"/papers/institute/{institute_id}", params={"limit": 50},
+                                headers=coe_headers)
+
+    async def paper_get(client, i):
+        return await client.get(f"/papers/{paper_ids[(i * 7919) % len(paper_ids)]}",
+                                headers=coe_headers)
+
+    async def paper_submit(client, i):
+        return await client.post("/papers/submit", json={
+            "title": f"Bench submission {i}", "difficulty": "medium", "questions": submit_questions
+        }, headers=faculty_headers[i % len(faculty)])
+
+    async def notifications_list(client, i):
+        n = i % len(faculty)
+        return await client.get(f"/notifications/{faculty[n]['id']}", headers=faculty_headers[n])
+
+    async def notifications_read(client, i):
+        n = i % len(faculty)
+        return await client.post(f"/notifications/{faculty[n]['id']}/read", json={},
+                                 headers=faculty_headers[n])
+
+    scenarios = [
+        Scenario("auth_login", auth_login, args.requests),
+        Scenario("generate_text", generate_text, args.requests),
+        Scenario("generate_text_images", generate_text_images, args.requests),
+        *[
+            Scenario(f"generate_pdf_{pages}p", generate_pdf(pdf), args.pdf_requests)
+            for pages, pdf in pdfs.items()
+        ],
+        Scenario("papers_list", papers_list, args.requests),
+        Scenario("paper_get", paper_get, args.requests),
+        Scenario("paper_submit", paper_submit, args.requests),
+        Scenario("notifications_list", notifications_list, args.requests),
+        Scenario("notifications_read", notifications_read, args.requests),
+    ]
+
+    if args.scenarios:
+        # "generate_pdf" selects every page count
+        wanted = set(args.scenarios)
+        scenarios = [
+            s for s in scenarios
+            if s.name in wanted or (s.name.startswith("generate_pdf_") and "generate_pdf" in wanted)
+        ]
+
+    return scenarios
+
+
+# -------------------------------------------------
+# RUNNER
+# -------------------------------------------------
+async def run_scenario(client, scenario, concurrency, warmup, pid, trace_heap=False) -> dict:
+    for i in range(warmup):
+        await scenario.send(client, i)
+
+    latencies = []
+    errors = 0
+    status_codes = {}
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < scenario.requests:
+            start = time.perf_counter()
+            try:
+                response = await scenario.send(client, warmup + i)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = "error"
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+            if status == "error" or status >= 400:
+                errors += 1
+
+    reset_peak_rss(pid)
+    if trace_heap:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "scenario": scenario.name,
+        "requests": scenario.requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "status_codes": status_codes,
+        "throughput_rps": round(scenario.requests / elapsed, 2),
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p95_ms": round(percentile(latencies, 95), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2),
+        "latency_max_ms": round(max(latencies, default=0.0), 2),
+        "latency_mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "peak_rss_mb": peak_rss_mb(pid),
+    }
+
+    if trace_heap:
+        result["python_heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+
+    return result
+
+
+async def run_inprocess(args, data, pdfs) -> list:
+    from backend.main import app
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     timeout=args.timeout) as client:
+            for scenario in build_scenarios(args, data, pdfs):
+                result = await run_scenario(client, scenario, args.concurrency, args.warmup,
+                                            os.getpid(), args.tracemalloc)
+                results.append({"mode": "inprocess", **result})
+                print_result(results[-1])
+
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    return results
+
+
+async def run_http(args, data, pdfs, env) -> list:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, cwd=ROOT
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    results = []
+
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency,
+                              max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            deadline = time.perf_counter() + 60
+            while True:
+                try:
+                    if (await client.get("/institutes/", params={"limit": 1})).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.perf_counter() > deadline or server.poll() is not None:
+                    raise RuntimeError("benchmark server did not start")
+                await asyncio.sleep(0.1)
+
+            for scenario in build_scenarios(args, data, pdfs):
+                result = await run_scenario(client, scenario, args.concurrency, args.warmup, server.pid)
+                results.append({"mode": "http", **result})
+                print_result(results[-1])
+    finally:
+        server.terminate()
+        server.wait()
+
+    return results
+
+
+def print_result(r):
+    print(
+        f"{r['mode']:<9} {r['scenario']:<22} {r['throughput_rps']:>9} req/s  "
+        f"p50 {r['latency_p50_ms']:>8} ms  p95 {r['latency_p95_ms']:>8} ms  "
+        f"p99 {r['latency_p99_ms']:>8} ms  rss {r['peak_rss_mb']} MB  errors {r['errors']}",
+        flush=True
+    )
+
+
+# -------------------------------------------------
+# REGRESSION CHECK
+# -------------------------------------------------
+def compare(previous: dict, current: dict, threshold: float) -> list:
+    """Print per-scenario changes; return the (mode, scenario) pairs that regressed."""
+    before = {(r["mode"], r["scenario"]): r for r in previous["results"]}
+    regressions = []
+
+    print(f"\nvs {previous['meta'].get('commit')} ({previous['meta'].get('timestamp')})")
+
+    for r in current["results"]:
+        old = before.get((r["mode"], r["scenario"]))
+        if old is None:
+            continue
+
+        p95 = (r["latency_p95_ms"] - old["latency_p95_ms"]) / max(old["latency_p95_ms"], 1e-9)
+        rps = (r["throughput_rps"] - old["throughput_rps"]) / max(old["throughput_rps"], 1e-9)
+        regressed = p95 > threshold or -rps > threshold
+
+        print(
+            f"{r['mode']:<9} {r['scenario']:<22} p95 {p95:+7.1%}  throughput {rps:+7.1%}"
+            + ("  <-- REGRESSION" if regressed else "")
+        )
+
+        if regressed:
+            regressions.append((r["mode"], r["scenario"]))
+
+    return regressions
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["inprocess", "http", "both"], default="inprocess")
+    parser.add_argument("--scenarios", nargs="+", help="names to run (default: all)")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--pdf-requests", type=int, default=20, help="requests per PDF scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--pdf-pages", type=int, nargs="+", default=[5, 50, 200])
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--wiki-latency", type=float, default=0.02, help="seconds per MediaWiki call")
+    parser.add_argument("--bcrypt-rounds", type=int, help="default: the app's BCRYPT_ROUNDS")
+    parser.add_argument("--faculty", type=int, default=20)
+    parser.add_argument("--papers", type=int, default=1000)
+    parser.add_argument("--notifications", type=int, default=100, help="per faculty")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also report the Python heap peak (in-process; slows it down)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="earlier --output file to diff against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative p95 / throughput change that counts as a regression")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="api-bench-")
+
+    with FakeMediaWiki(args.wiki_latency) as wiki:
+        # the backend reads its config at import: set it before importing anything
+        env = {
+            "PYTHONPATH": ROOT,
+            "DATABASE_URL": f"sqlite:///{os.path.join(folder, 'inprocess.db')}",
+            "LLM_PROVIDER": "fake",
+            "FAKE_LLM_LATENCY": str(args.llm_latency),
+            "FAKE_LLM_SEED": str(args.seed),
+            "LLM_CACHE_ENABLED": "0",  # every generation reaches the (fake) model
+            "WIKIPEDIA_API_URL": wiki.url,
+            "JWT_SECRET_KEY": "benchmark-secret-not-for-production-use",
+            "LOG_LEVEL": "WARNING",
+            "RUN_MIGRATIONS_ON_STARTUP": "1",
+        }
+        if args.bcrypt_rounds:
+            env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+        os.environ.update(env)
+        sys.path.insert(0, ROOT)
+
+        try:
+            template = os.path.join(folder, "template.db")
+            started = time.perf_counter()
+            data = seed_database(f"sqlite:///{template}", args.faculty, args.papers,
+                                 args.notifications, args.seed)
+            pdfs = {pages: make_pdf(pages, args.seed) for pages in args.pdf_pages}
+            print(f"seeded {args.papers} papers / {args.faculty} faculty and "
+                  f"{len(pdfs)} PDFs in {time.perf_counter() - started:.1f} s", flush=True)
+
+            results = []
+
+            if args.mode in ("inprocess", "both"):
+                shutil.copy(template, os.path.join(folder, "inprocess.db"))
+                results += asyncio.run(run_inprocess(args, data, pdfs))
+
+            if args.mode in ("http", "both"):
+                shutil.copy(template, os.path.join(folder, "http.db"))
+                http_env = {**os.environ,
+                            "DATABASE_URL": f"sqlite:///{os.path.join(folder, 'http.db')}"}
+                results += asyncio.run(run_http(args, data, pdfs, http_env))
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+SQLite read/write contention benchmark.
+
+A writer process keeps opening write transactions that hold the lock for a
+while (like a paper submission or COE approval), while reader processes run
+the paper listing query. The same workload runs against the old
+engine settings (rollback journal, default PRAGMAs) and the tuned profile
+from backend/app/db/database.py (WAL, synchronous=NORMAL, mmap, cache).
+
+    python -m benchmarks.db_contention --seconds 5 --readers 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from backend.app.db.database import make_engine
+
+
+def build_engine(url, profile):
+    if profile == "legacy":
+        # the previous hard-coded engine: rollback journal, default PRAGMAs
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": 30},
+            pool_pre_ping=True
+        )
+    return make_engine(url)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def setup(engine, rows):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE question_papers ("
+            "id INTEGER PRIMARY KEY, institute_id INTEGER, faculty_id INTEGER, "
+            "status TEXT, content TEXT)"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO question_papers (institute_id, faculty_id, status, content) "
+                "VALUES (:i, :f, 'pending', :c)"
+            ),
+            [{"i": n % 10, "f": n % 50, "c": "x" * 500} for n in range(rows)]
+        )
+
+
+def _writer(url, profile, stop, batch, content_bytes, hold_ms, out):
+    engine = build_engine(url, profile)
+    writes = 0
+
+    while not stop.is_set():
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO question_papers (institute_id, faculty_id, status, content) "
+                    "VALUES (3, 1, 'pending', :c)"
+                ),
+                [{"c": "q" * content_bytes} for _ in range(batch)]
+            )
+            time.sleep(hold_ms / 1000)  # lock held, as in a slow request
+        writes += 1
+
+    engine.dispose()
+    out.put(("writes", writes))
+
+
+def _reader(url, profile, stop, out):
+    engine = build_engine(url, profile)
+    latencies = []
+
+    while not stop.is_set():
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text(
+                "SELECT id, status FROM question_papers WHERE institute_id = 3 "
+                "ORDER BY id DESC LIMIT 50"
+            )).fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    engine.dispose()
+    out.put(("reads", latencies))
+
+
+def run(profile, seconds, readers, hold_ms, rows, batch, content_bytes, directory=None):
+    # use a real disk (not tmpfs) so fsync and lock costs show up
+    folder = tempfile.mkdtemp(prefix="dbbench-", dir=directory)
+    url = f"sqlite:///{os.path.join(folder, 'bench.db')}"
+
+    engine = build_engine(url, profile)
+    setup(engine, rows)
+    engine.dispose()
+
+    # separate processes, like separate uvicorn workers: no shared GIL
+    stop = multiprocessing.Event()
+    out = multiprocessing.Queue()
+
+    procs = [multiprocessing.Process(
+        target=_writer,
+        args=(url, profile, stop, batch, content_bytes, hold_ms, out)
+    )]
+    procs += [
+        multiprocessing.Process(target=_reader, args=(url, profile, stop, out))
+        for _ in range(readers)
+    ]
+
+    for p in procs:
+        p.start()
+    time.sleep(seconds)
+    stop.set()
+
+    read_latencies = []
+    writes = 0
+    for _ in procs:
+        kind, value = out.get()
+        if kind == "writes":
+            writes = value
+        else:
+            read_latencies.extend(value)
+
+    for p in procs:
+        p.join()
+
+    shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "profile": profile,
+        "reads": len(read_latencies),
+        "reads_per_sec": round(len(read_latencies) / seconds, 1),
+        "writes": writes,
+        "read_p50_ms": round(percentile(read_latencies, 50), 3),
+        "read_p95_ms": round(percentile(read_latencies, 95), 3),
+        "read_p99_ms": round(percentile(read_latencies, 99), 3),
+        "read_max_ms": round(max(read_latencies, default=0.0), 3),
+        "read_mean_ms": round(statistics.fmean(read_latencies), 3) if read_latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--hold-ms", type=float, default=20, help="write lock hold time")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000, help="rows per write transaction")
+    parser.add_argument("--content-bytes", type=int, default=4000, help="size of each paper")
+    parser.add_argument("--dir", default=".", help="directory for the scratch database")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = [
+        run(mode, args.seconds, args.readers, args.hold_ms, args.rows,
+            args.batch, args.content_bytes, args.dir)
+        for mode in ("legacy", "tuned")
+    ]
+
+    for result in results:
+        print(
+            f"{result['profile']:>7}: {result['reads_per_sec']:>9} reads/s  "
+            f"p50 {result['read_p50_ms']} ms  p99 {result['read_p99_ms']} ms  "
+            f"max {result['read_max_ms']} ms  writes {result['writes']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
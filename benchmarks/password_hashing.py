@@ -0,0 +1,106 @@
+"""
+Login throughput at different bcrypt cost factors.
+
+Each round fires a burst of concurrent password verifications (the CPU part
+of /auth/login) through the bounded PasswordHasher from
+backend/app/core/security.py, and records logins/sec, per-login latency and
+the worst event-loop stall seen by a ticker task while the burst runs.
+
+    python -m benchmarks.password_hashing --rounds 10 11 12 --logins 64
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from backend.app.core.security import (
+    PASSWORD_HASH_WORKERS,
+    PasswordHasher,
+    hash_password,
+    make_password_context,
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def _loop_lag(stop: asyncio.Event, interval=0.005):
+    """Largest delay between when a sleep should end and when it did."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(rounds, logins, workers):
+    context = make_password_context(rounds)
+    hashed = hash_password(PASSWORD, context)
+    hasher = PasswordHasher(workers=workers, max_queue=logins, context=context)
+
+    latencies = []
+
+    async def login():
+        start = time.perf_counter()
+        assert await hasher.verify(PASSWORD, hashed)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_loop_lag(stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    lag = await ticker
+    stats = hasher.stats()
+    hasher.shutdown()
+
+    return {
+        "bcrypt_rounds": rounds,
+        "workers": workers,
+        "logins": logins,
+        "logins_per_sec": round(logins / elapsed, 2),
+        "latency_p50_ms": round(percentile(latencies, 50), 1),
+        "latency_p95_ms": round(percentile(latencies, 95), 1),
+        "latency_max_ms": round(max(latencies, default=0.0), 1),
+        "hash_ms": stats["avg_run_ms"],
+        "queue_wait_ms": stats["avg_wait_ms"],
+        "max_waiting": stats["max_waiting"],
+        "loop_lag_max_ms": round(lag * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--logins", type=int, default=32, help="concurrent logins per burst")
+    parser.add_argument("--workers", type=int, default=PASSWORD_HASH_WORKERS)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run(r, args.logins, args.workers)) for r in args.rounds]
+
+    for result in results:
+        print(
+            f"cost {result['bcrypt_rounds']:>2}: {result['logins_per_sec']:>8} logins/s  "
+            f"hash {result['hash_ms']} ms  p95 {result['latency_p95_ms']} ms  "
+            f"loop lag max {result['loop_lag_max_ms']} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Serialization time and bytes on the wire for the two big payloads: a
+50-question paper (GET /papers/{id}) and a 1,000-paper institute listing
+(GET /papers/institute/{id}).
+
+"before" is what FastAPI did for these routes: jsonable_encoder plus the
+stdlib JSONResponse for the paper and listing, and validation through
+QuestionResponse for generated questions. "after" is FastJSONResponse
+(orjson) returned straight from the route. Wire sizes use the
+CompressionMiddleware settings.
+
+    python -m benchmarks.serialization --iterations 200 --output serialization.json
+"""
+import argparse
+import gzip
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.app.schemas.question_schema import QuestionResponse
+from backend.app.utils.compression import BROTLI_QUALITY, GZIP_LEVEL, brotli
+from backend.app.utils.json_response import FastJSONResponse
+
+WORDS = (
+    "photosynthesis chlorophyll membrane enzyme substrate equilibrium entropy "
+    "osmosis gradient catalyst isotope molecule polymer oxidation respiration"
+).split()
+
+
+def _text(seed, n):
+    return " ".join(WORDS[(seed * 7 + i * 3) % len(WORDS)] for i in range(n))
+
+
+def make_questions(count=50):
+    questions = []
+    for i in range(count):
+        if i % 2:
+            questions.append({
+                "question": f"Q{i}: {_text(i, 18)}?",
+                "options": [_text(i + k, 4) for k in range(4)],
+                "correct_answer": _text(i, 4),
+                "image_url": None,
+            })
+        else:
+            questions.append({
+                "question": f"Q{i}: explain {_text(i, 20)}.",
+                "model_answer": _text(i, 90),
+                "key_points": [_text(i + k, 8) for k in range(4)],
+                "expected_keywords": _text(i, 6).split(),
+                "image_url": f"https://upload.wikimedia.org/thumb/{i}.png",
+            })
+    return questions
+
+
+def make_paper(count=50):
+    created = datetime(2026, 3, 1, 9, 30)
+    questions = [
+        {"id": i + 1, "position": i, "question_type": "mcq" if "options" in q else "descriptive",
+         "difficulty": "medium", **q}
+        for i, q in enumerate(make_questions(count))
+    ]
+    return {
+        "id": 1, "title": "Unit 3 - Plant physiology", "faculty_id": 7, "institute_id": 1,
+        "status": "pending", "created_at": created, "question_count": count,
+        "questions": questions,
+    }
+
+
+def make_listing(count=1000):
+    start = datetime(2026, 1, 1)
+    return [
+        {"id": count - i, "title": f"Paper {count - i}", "faculty_id": 7 + i % 40,
+         "institute_id": 1, "status": ("pending", "approved", "rejected")[i % 3],
+         "created_at": start + timedelta(minutes=17 * i), "question_count": 10 + i % 40}
+        for i in range(count)
+    ]
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return body, round(statistics.median(samples), 3)
+
+
+def wire_sizes(body: bytes) -> dict:
+    sizes = {"identity": len(body), "gzip": len(gzip.compress(body, GZIP_LEVEL))}
+    if brotli is not None:
+        sizes["br"] = len(brotli.compress(body, quality=BROTLI_QUALITY))
+    return sizes
+
+
+def compare(name, before, after, iterations):
+    before_body, before_ms = timed(before, iterations)
+    after_body, after_ms = timed(after, iterations)
+    assert json.loads(before_body) == json.loads(after_body), name
+
+    return {
+        "payload": name,
+        "before_ms": before_ms,
+        "after_ms": after_ms,
+        "speedup": round(before_ms / after_ms, 1) if after_ms else None,
+        "bytes": wire_sizes(after_body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--papers", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    paper = make_paper(args.questions)
+    listing = make_listing(args.papers)
+    generated = {"questions": make_questions(args.questions), "duplicates_removed": 0}
+    response_adapter = TypeAdapter(QuestionResponse)
+
+    results = [
+        compare(
+            f"paper ({args.questions} questions)",
+            lambda: JSONResponse(jsonable_encoder(paper)).body,
+            lambda: FastJSONResponse(paper).body,
+            args.iterations,
+        ),
+        compare(
+            f"institute listing ({args.papers} papers)",
+            lambda: JSONResponse(jsonable_encoder(listing)).body,
+            lambda: FastJSONResponse(listing).body,
+            args.iterations,
+        ),
+        compare(
+            f"generated questions ({args.questions})",
+            lambda: response_adapter.dump_json(response_adapter.validate_python(generated)),
+            lambda: FastJSONResponse(generated).body,
+            args.iterations,
+        ),
+    ]
+
+    for r in results:
+        sizes = "  ".join(f"{k} {v:,} B" for k, v in r["bytes"].items())
+        print(f"{r['payload']:<34} {r['before_ms']:>8} ms -> {r['after_ms']:>7} ms  ({r['speedup']}x)  {sizes}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Cold-start benchmark: time to import backend.main and time until a freshly
+spawned uvicorn worker answers its first request.
+
+Each run starts a new interpreter against a scratch SQLite database (already
+migrated, as after a deploy), with the fake LLM provider. Use --history to
+append one JSON line per invocation and track the numbers across commits.
+
+    python -m benchmarks.startup_time --runs 5 --history startup_history.jsonl
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import backend.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _env(database_url):
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": ROOT,
+        "DATABASE_URL": database_url,
+        "LLM_PROVIDER": "fake",
+        "LLM_CACHE_PATH": os.path.join(os.path.dirname(database_url[len("sqlite:///"):]), "llm_cache.db"),
+        "RUN_MIGRATIONS_ON_STARTUP": "0",
+    })
+    env.setdefault("JWT_SECRET_KEY", "benchmark-secret-not-for-production-use")
+    return env
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(env) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_first_response(env, path, timeout=60.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("server did not answer in time")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/institutes/?limit=1", help="first request")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--history", help="append one JSON line to this file")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="startup-bench-")
+    env = _env(f"sqlite:///{os.path.join(folder, 'bench.db')}")
+
+    try:
+        # migrate once, like the deploy step
+        subprocess.run([sys.executable, "-m", "backend.app.db.migrations"], env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+        imports = [measure_import(env) for _ in range(args.runs)]
+        firsts = [measure_first_response(env, args.path) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "import_median_s": round(statistics.median(imports), 3),
+        "import_max_s": round(max(imports), 3),
+        "first_response_median_s": round(statistics.median(firsts), 3),
+        "first_response_max_s": round(max(firsts), 3),
+    }
+
+    print(
+        f"import {result['import_median_s']} s (max {result['import_max_s']})  "
+        f"first response {result['first_response_median_s']} s (max {result['first_response_max_s']})"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import streamlit as st
 import requests
+import json
+import time
 from docx import Document
 from io import BytesIO
 
@@ -56,7 +58,9 @@ def create_answer_file(questions, question_type):
 
 
 
+API_BASE = "http://127.0.0.1:8000"
 TEXT_API = "http://127.0.0.1:8000/generate-questions"
+TEXT_STREAM_API = "http://127.0.0.1:8000/generate-questions/stream"
 PDF_API = "http://127.0.0.1:8000/generate-questions-from-pdf"
 
 st.set_page_config("Question Generator", "📘")
@@ -121,9 +125,29 @@ with tab1:
             "question_type": question_type
         }
 
-        res = requests.post(TEXT_API, json=payload)
+        # ✅ stream questions and show each one as soon as it arrives
+        res = requests.post(TEXT_STREAM_API, json=payload, stream=True)
         if res.status_code == 200:
-            st.session_state["questions"] = res.json()["questions"]
+            streamed = []
+            preview = st.empty()
+
+            for line in res.iter_lines():
+                if not line:
+                    continue
+
+                event = json.loads(line)
+
+                if event["type"] == "question":
+                    streamed.append(event["question"])
+                    preview.info(
+                        f"Received {len(streamed)} question(s)... "
+                        f"latest: {event['question']['question']}"
+                    )
+                elif event["type"] == "error":
+                    st.error(event["detail"])
+
+            preview.empty()
+            st.session_state["questions"] = streamed
             st.session_state["question_type"] = question_type
         else:
             st.error(res.text)
@@ -169,10 +193,30 @@ with tab2:
             "question_type": pdf_question_type
         }
 
+        # ✅ submit as a background job and poll, so long PDFs don't time out
+        params["async_job"] = True
+
         res = requests.post(PDF_API, files=files, params=params)
-        if res.status_code == 200:
-            st.session_state["questions"] = res.json()["questions"]
-            st.session_state["question_type"] = pdf_question_type
+        if res.status_code == 202:
+            job_url = API_BASE + res.json()["status_url"]
+            progress = st.progress(0, text="Queued...")
+
+            while True:
+                job = requests.get(job_url).json()
+                progress.progress(job["progress"], text=job["stage"] or job["status"])
+
+                if job["status"] in ("succeeded", "failed"):
+                    break
+
+                time.sleep(2)
+
+            progress.empty()
+
+            if job["status"] == "succeeded":
+                st.session_state["questions"] = job["result"]["questions"]
+                st.session_state["question_type"] = pdf_question_type
+            else:
+                st.error(job["error"])
         else:
             st.error(res.text)
 
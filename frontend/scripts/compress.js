@@ -0,0 +1,32 @@
+// Writes .br and .gz next to every compressible file in dist/, so the
+// backend can serve them as-is (see backend/app/utils/static_manifest.py).
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { join } from 'node:path'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+const DIST = new URL('../dist/', import.meta.url).pathname
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|map)$/
+const MIN_BYTES = 1024
+
+function walk(dir) {
+  for (const name of readdirSync(dir)) {
+    const path = join(dir, name)
+
+    if (statSync(path).isDirectory()) {
+      walk(path)
+      continue
+    }
+
+    if (!COMPRESSIBLE.test(name)) continue
+
+    const source = readFileSync(path)
+    if (source.length < MIN_BYTES) continue
+
+    writeFileSync(`${path}.gz`, gzipSync(source, { level: 9 }))
+    writeFileSync(`${path}.br`, brotliCompressSync(source, {
+      params: { [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY },
+    }))
+  }
+}
+
+walk(DIST)
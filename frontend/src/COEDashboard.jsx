@@ -2,9 +2,15 @@ import { useEffect, useState } from "react";
 
 const BASE_URL = "http://127.0.0.1:8000";
 
+// ✅ JWT from login
+const authHeaders = () => ({
+  Authorization: `Bearer ${localStorage.getItem("token")}`,
+});
+
 export default function COEDashboard({ handleLogout }) {
   const [papers, setPapers] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [questionsByPaper, setQuestionsByPaper] = useState({});
 
   const instituteId = localStorage.getItem("institute_id");
 
@@ -12,7 +18,9 @@ export default function COEDashboard({ handleLogout }) {
   const fetchPapers = () => {
     setLoading(true);
 
-    fetch(`${BASE_URL}/papers/institute/${instituteId}`)
+    fetch(`${BASE_URL}/papers/institute/${instituteId}`, {
+      headers: authHeaders(),
+    })
       .then((res) => res.json())
       .then((data) => {
         setPapers(data);
@@ -35,6 +43,7 @@ export default function COEDashboard({ handleLogout }) {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
+          ...authHeaders(),
         },
         body: JSON.stringify({ status }),
       });
@@ -51,14 +60,54 @@ export default function COEDashboard({ handleLogout }) {
     }
   };
 
-  // ---------------- PARSE QUESTIONS ----------------
-  const parseQuestions = (content) => {
+  // ---------------- BULK REVIEW ----------------
+  const approveAllPending = async () => {
+    const reviews = papers
+      .filter((paper) => paper.status === "pending")
+      .map((paper) => ({ paper_id: paper.id, status: "approved" }));
+
+    if (reviews.length === 0) return;
+
     try {
-      if (Array.isArray(content)) return content;
-      if (typeof content === "string") return JSON.parse(content);
-      return [];
-    } catch {
-      return [];
+      const res = await fetch(`${BASE_URL}/papers/review`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          ...authHeaders(),
+        },
+        body: JSON.stringify({ reviews }),
+      });
+
+      if (res.ok) {
+        const data = await res.json();
+        alert(`${data.updated} papers approved ✅${data.failed ? `, ${data.failed} failed ❌` : ""}`);
+        fetchPapers();
+      } else {
+        alert("Failed to update ❌");
+      }
+    } catch (err) {
+      console.error(err);
+      alert("Server error ❌");
+    }
+  };
+
+  // ---------------- LOAD QUESTIONS (on demand) ----------------
+  const toggleQuestions = async (paperId) => {
+    if (questionsByPaper[paperId]) {
+      const { [paperId]: _, ...rest } = questionsByPaper;
+      setQuestionsByPaper(rest);
+      return;
+    }
+
+    try {
+      const res = await fetch(`${BASE_URL}/papers/${paperId}`, {
+        headers: authHeaders(),
+      });
+      const data = await res.json();
+      setQuestionsByPaper({ ...questionsByPaper, [paperId]: data.questions || [] });
+    } catch (err) {
+      console.error(err);
+      alert("Failed to load questions ❌");
     }
   };
 
@@ -85,12 +134,23 @@ export default function COEDashboard({ handleLogout }) {
           COE Dashboard
         </h1>
 
-        <button
-          onClick={handleLogout}
-          className="bg-red-500 hover:bg-red-600 text-white px-4 py-2 rounded"
-        >
-          Logout
-        </button>
+        <div className="flex gap-3">
+          {papers.some((paper) => paper.status === "pending") && (
+            <button
+              onClick={approveAllPending}
+              className="bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded"
+            >
+              Approve all pending
+            </button>
+          )}
+
+          <button
+            onClick={handleLogout}
+            className="bg-red-500 hover:bg-red-600 text-white px-4 py-2 rounded"
+          >
+            Logout
+          </button>
+        </div>
       </div>
 
       {/* NO DATA */}
@@ -100,7 +160,7 @@ export default function COEDashboard({ handleLogout }) {
         </p>
       ) : (
         papers.map((paper) => {
-          const questions = parseQuestions(paper.content);
+          const questions = questionsByPaper[paper.id];
 
           return (
             <div
@@ -129,11 +189,20 @@ export default function COEDashboard({ handleLogout }) {
 
               {/* QUESTIONS */}
               <div className="bg-gray-100 p-4 rounded-lg mb-4 max-h-60 overflow-y-auto">
-                <h3 className="font-semibold mb-2 text-gray-700">
-                  Questions
-                </h3>
+                <div className="flex justify-between items-center mb-2">
+                  <h3 className="font-semibold text-gray-700">
+                    Questions ({paper.question_count})
+                  </h3>
+
+                  <button
+                    onClick={() => toggleQuestions(paper.id)}
+                    className="text-sm text-indigo-600 hover:underline"
+                  >
+                    {questions ? "Hide" : "View"}
+                  </button>
+                </div>
 
-                {questions.length === 0 ? (
+                {!questions ? null : questions.length === 0 ? (
                   <p className="text-sm text-gray-500">
                     No questions found ❌
                   </p>
@@ -2,6 +2,11 @@ import { useState, useEffect } from "react";
 
 const BASE_URL = "http://127.0.0.1:8000";
 
+// ✅ JWT from login
+const authHeaders = () => ({
+  Authorization: `Bearer ${localStorage.getItem("token")}`,
+});
+
 export default function FacultyDashboard({ handleLogout }) {
   const [questions, setQuestions] = useState([]);
   const [loading, setLoading] = useState(false);
@@ -11,16 +16,61 @@ export default function FacultyDashboard({ handleLogout }) {
   const [topic, setTopic] = useState("");
   const [content, setContent] = useState("");
 
-  // ---------------- FETCH NOTIFICATIONS ----------------
+  // ---------------- NOTIFICATIONS (initial page + live stream) ----------------
   useEffect(() => {
     const facultyId = localStorage.getItem("user_id");
+    let source = null;
+    let closed = false;
 
-    fetch(`${BASE_URL}/notifications/${facultyId}`)
+    fetch(`${BASE_URL}/notifications/${facultyId}`, {
+      headers: authHeaders(),
+    })
       .then((res) => res.json())
-      .then((data) => setNotifications(data))
+      .then((data) => {
+        if (closed) return;
+        setNotifications(data);
+
+        // 🔔 push: the browser reconnects on its own and replays what it missed
+        // (EventSource cannot send headers, so the token goes in the URL)
+        const sinceId = data.length > 0 ? data[0].id : 0;
+        const token = encodeURIComponent(localStorage.getItem("token"));
+        source = new EventSource(
+          `${BASE_URL}/notifications/${facultyId}/stream?since_id=${sinceId}&access_token=${token}`
+        );
+        source.addEventListener("notification", (e) => {
+          const n = JSON.parse(e.data);
+          setNotifications((prev) =>
+            prev.some((p) => p.id === n.id) ? prev : [n, ...prev]
+          );
+        });
+      })
       .catch((err) => console.error(err));
+
+    return () => {
+      closed = true;
+      if (source) source.close();
+    };
   }, []);
 
+  // ---------------- MARK NOTIFICATIONS READ ----------------
+  const markAllRead = async () => {
+    const facultyId = localStorage.getItem("user_id");
+
+    try {
+      await fetch(`${BASE_URL}/notifications/${facultyId}/read`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          ...authHeaders(),
+        },
+        body: JSON.stringify({}),
+      });
+      setNotifications((prev) => prev.map((n) => ({ ...n, is_read: true })));
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   // ---------------- GENERATE QUESTIONS ----------------
   const generateQuestions = async () => {
     if (!topic && !content) {
@@ -35,6 +85,7 @@ export default function FacultyDashboard({ handleLogout }) {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          ...authHeaders(),
         },
         body: JSON.stringify({
           topic,
@@ -73,6 +124,7 @@ export default function FacultyDashboard({ handleLogout }) {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          ...authHeaders(),
         },
         body: JSON.stringify({
           faculty_id: Number(localStorage.getItem("user_id")),
@@ -115,10 +167,25 @@ export default function FacultyDashboard({ handleLogout }) {
       {/* 🔔 NOTIFICATIONS */}
       {notifications.length > 0 && (
         <div className="max-w-3xl mx-auto mb-4">
+          {notifications.some((n) => !n.is_read) && (
+            <div className="text-right mb-2">
+              <button
+                onClick={markAllRead}
+                className="text-sm text-indigo-600 hover:underline"
+              >
+                Mark all as read
+              </button>
+            </div>
+          )}
+
           {notifications.map((n) => (
             <div
               key={n.id}
-              className="bg-yellow-100 border-l-4 border-yellow-500 p-3 mb-2 rounded shadow"
+              className={`border-l-4 p-3 mb-2 rounded shadow ${
+                n.is_read
+                  ? "bg-gray-100 border-gray-400 text-gray-600"
+                  : "bg-yellow-100 border-yellow-500"
+              }`}
             >
               🔔 {n.message}
             </div>
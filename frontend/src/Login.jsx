@@ -41,6 +41,7 @@ export default function Login({ setIsLoggedIn, setUserRole, role }) {
         localStorage.setItem("role", role);
         localStorage.setItem("user_id", data.user_id);
         localStorage.setItem("institute_id", data.institute_id);
+        localStorage.setItem("token", data.access_token);
       } else {
         alert(data.detail || "Invalid credentials ❌");
       }
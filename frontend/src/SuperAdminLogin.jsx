@@ -29,6 +29,7 @@ export default function SuperAdminLogin({ setIsLoggedIn, setUserRole, setShowSig
         setUserRole("superadmin");
 
         localStorage.setItem("role", "superadmin");
+        localStorage.setItem("token", data.access_token);
       } else {
         alert(data.detail || "Invalid credentials ❌");
       }